@@ -1,5 +1,8 @@
 from datagym.client import Client   # noqa
+from datagym.async_client import AsyncClient   # noqa
 from datagym.importers.coco import Coco   # noqa
+from datagym.importers.yolo import Yolo   # noqa
+from datagym.importers.voc import PascalVoc   # noqa
 from datagym.exceptions.exceptions import ClientException, APIException   # noqa
 from datagym.models.label_config import LabelConfig # noqa
 from datagym.models.image import Image  # noqa
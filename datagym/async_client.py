@@ -0,0 +1,700 @@
+import asyncio
+import io
+import os
+import json
+import logging
+from collections.abc import Sized
+from pathlib import Path
+from typing import List, Dict, BinaryIO, Optional, Union, Iterable, Tuple
+from requests.auth import HTTPBasicAuth
+from .endpoints import Endpoint
+from .models import Project, Dataset, Image, Video
+from datagym.exceptions.exceptions import (DatagymException,
+                                           ExceptionMessageBuilder,
+                                           validate_response)
+from datagym.utils.checkpoint import BatchJournal
+from datagym.utils.concurrency import async_bounded_map, chunked
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncClient:
+    """The AsyncClient class provides asyncio access to DataGym's API.
+
+    It mirrors the :class:`.Client` and returns the same models and
+    raises the same exceptions. All requests share one connection
+    pool, the number of requests in flight is bounded by
+    max_concurrency. The AsyncClient requires aiohttp, install it with
+    ``pip install datagym[async]``.
+
+    .. code-block:: python
+
+       from datagym import AsyncClient
+
+       async with AsyncClient(api_key='API_KEY') as client:
+           projects = await client.get_projects()
+
+    """
+
+    MAX_NUM_URLS_PER_UPLOAD = 50
+    STREAM_CHUNK_SIZE = 64 * 1024
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_MAX_CONCURRENCY = 10
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, api_key: str, base_url: str = 'https://app.datagym.ai/',
+                 basic_auth: Optional[HTTPBasicAuth] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """ Initializes DataGym AsyncClient instance
+
+        :param base_url: URL to your Datagym instance
+        :param str api_key: The API key of your organization
+        :param Optional(HTTPBasicAuth) basic_auth: The basic authentification (username, password) for Datagym.ai
+        :param int pool_size: The maximum number of connections kept open
+        :param int max_concurrency: The maximum number of requests in flight at once
+
+        """
+        if aiohttp is None:
+            raise ImportError("The AsyncClient requires aiohttp, install it with 'pip install datagym[async]'")
+
+        self._endpoint = Endpoint(base_path=base_url)
+        """ An instance of :class:`.Endpoint`.
+
+        Provides the endpoints of DataGym's API
+        """
+
+        self._msg_builder = ExceptionMessageBuilder()
+        """An instance of :class:`.ExceptionMessageBuilder`.
+
+        Builds readable messages from DataGym endpoint exceptions
+
+        """
+
+        self._session: Optional['aiohttp.ClientSession'] = None
+        """An instance of :class:`aiohttp.ClientSession`.
+
+        Created with the first request, as it has to be bound to the running event loop
+
+        """
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        """An instance of :class:`asyncio.Semaphore`.
+
+        Bounds the number of requests in flight
+
+        """
+
+        self._pool_size = pool_size
+        self._max_concurrency = max_concurrency
+        self.__api_key = api_key
+        self.__basic_auth = aiohttp.BasicAuth(basic_auth.username, basic_auth.password) if basic_auth else None
+
+    def __repr__(self):
+        return f'AsyncClient(api_key="{self.__api_key}")'
+
+    def __str__(self):
+        return self.__repr__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """ Get the shared ClientSession, create it on first use
+
+        :returns: The ClientSession with the connection pool
+        :rtype: aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._pool_size)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def close(self) -> None:
+        """ Close all pooled connections of this AsyncClient """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(
+            self,
+            method: str,
+            endpoint: str,
+            headers: Optional[dict] = None,
+            json: Optional[Union[list, dict]] = None,
+            data: Optional[Union[BinaryIO, dict]] = None
+    ) -> Tuple['aiohttp.ClientResponse', bytes]:
+        """ Send a HTTP request to a DataGym endpoint and read the response body
+
+        :param str method: The HTTP method (ex. GET, POST, PUT, etc.)
+        :param str endpoint: The DataGym API endpoint
+        :param dict headers: The HTTP request header
+        :param dict json: The request body as json
+        :param dict data: The request body
+
+        :raises aiohttp.ClientError: Connection errors
+
+        :returns: HTTP Response and its body, the connection is already released
+        :rtype: Tuple[aiohttp.ClientResponse, bytes]
+        """
+        session = self._get_session()
+        url = self._endpoint.BASE_PATH + endpoint
+
+        async with self._semaphore:
+            async with session.request(method, url, auth=self.__basic_auth,
+                                       headers=headers, json=json, data=data) as response:
+                return response, await response.read()
+
+    def _response_valid(self, response: 'aiohttp.ClientResponse', content: bytes) -> bool:
+        """ Checks if Response from DataGym was successful
+
+        :param aiohttp.ClientResponse response:
+        :param bytes content: The response body
+        :returns: True if response was successful
+        :rtype: bool
+        """
+        valid = validate_response(self._msg_builder, self.logger, response.status, content)
+        if valid is None:
+            response.raise_for_status()
+        return valid
+
+    async def _get_projects_without_images(self) -> List[Project]:
+        """ Fetch all Projects with all Datasets but without Images
+
+        :returns: A list of all Projects without Images from your organization
+        :rtype: List[Project]
+
+        """
+        response, content = await self._request(method="GET",
+                                                endpoint=self._endpoint.project(token=self.__api_key))
+
+        if self._response_valid(response, content):
+            return [Project(project) for project in json.loads(content)]
+
+    async def get_projects(self) -> List[Project]:
+        """ Fetch all Projects with all Datasets and Images
+
+        Only the Datasets of the Projects are fetched by ID, each
+        Dataset once and concurrently, instead of all Datasets of
+        the organization.
+
+        :returns: A List of all Projects from your organization
+        :rtype: List[Project]
+
+        """
+        projects = await self._get_projects_without_images()
+
+        dataset_ids = list(dict.fromkeys(d.id for project in projects for d in project.datasets))
+        datasets = await asyncio.gather(*(self.get_dataset_by_id(dataset_id) for dataset_id in dataset_ids))
+        datasets_by_id = dict(zip(dataset_ids, datasets))
+
+        for project in projects:
+            # Keep the Dataset without media if it can not be loaded
+            project.datasets = [datasets_by_id[d.id] or d for d in project.datasets]
+
+        return projects
+
+    async def get_project_by_name(self, project_name: str) -> Project or None:
+        """ Fetch Project by its name from DataGym
+
+        Only the Datasets of the matching Project are fetched.
+
+        :param str project_name: The Project name
+        :returns: The Project with the given name
+        :rtype: Project or None
+
+        """
+        for project in await self._get_projects_without_images():
+            if project.name == project_name:
+                datasets = await asyncio.gather(*(self.get_dataset_by_id(d.id) for d in project.datasets))
+                project.datasets = [dataset or d for dataset, d in zip(datasets, project.datasets)]
+                return project
+
+        return None
+
+    async def get_datasets(self) -> List[Dataset]:
+        """ Fetch all Datasets from DataGym
+
+        :returns: List of all Datasets from your organization
+        :rtype: List[Dataset]
+
+        """
+        response, content = await self._request(method="GET",
+                                                endpoint=self._endpoint.dataset(token=self.__api_key))
+
+        if self._response_valid(response, content):
+            return [Dataset(dataset) for dataset in json.loads(content)]
+
+    async def get_dataset_by_id(self, dataset_id: str) -> Dataset or None:
+        """ Fetch Dataset with all Images by its ID from DataGym
+
+        :param str dataset_id: The Dataset ID
+        :returns: The Dataset with the given ID
+        :rtype: Dataset or None
+
+        """
+        endpoint = self._endpoint.get_dataset_by_id(dataset_id, token=self.__api_key)
+
+        response, content = await self._request(method="GET", endpoint=endpoint)
+
+        if self._response_valid(response, content):
+            return Dataset(json.loads(content))
+
+        return None
+
+    async def get_dataset_by_name(self, dataset_name: str) -> Dataset or None:
+        """ Fetch Dataset by its name from DataGym
+
+        :param str dataset_name: The Dataset's name
+        :returns: The Dataset with the given name
+        :rtype: Dataset or None
+
+        """
+        for dataset in await self.get_datasets():
+            if dataset.name == dataset_name:
+                return dataset
+
+        return None
+
+    async def _fetch_task_labels(self, media_export: Dict) -> Dict:
+        """ Fetch the labels of a single media export and add them in place
+
+        :param Dict media_export: A media entry of the project export
+        :returns: The media entry with its 'labels'
+        :rtype: Dict
+
+        """
+        if 'task_export_url' in media_export:
+            # Remove the beginning to leave only endpoint
+            inner_endpoint = media_export['task_export_url'].replace(self._endpoint.BASE_PATH, "")
+
+            inner_response, inner_content = await self._request(method="GET", endpoint=inner_endpoint)
+
+            if self._response_valid(inner_response, inner_content):
+                media_export['labels'] = json.loads(inner_content)
+        return media_export
+
+    async def export_labels(self, project_id: str) -> Dict:
+        """ Export the labeled data from a specific Project
+
+        The task labels are fetched concurrently, bounded by max_concurrency.
+
+        :param str project_id: The Project ID
+        :returns: The labeled data as Dictionary
+        :rtype: Dict
+
+        """
+        endpoint = self._endpoint.export_labels(project_id, token=self.__api_key)
+
+        response, content = await self._request(method="GET", endpoint=endpoint)
+
+        if self._response_valid(response, content):
+            export_dict = json.loads(content)
+
+            await asyncio.gather(*(self._fetch_task_labels(media_export) for media_export in export_dict[1:]))
+            return export_dict
+        else:
+            return dict()
+
+    async def export_labels_url(self, project_id: str) -> str:
+        """ Generate a URL to the labeled data from a specific Project
+
+        :param str project_id: The Project ID
+        :returns: A URL to the labeled data from a given Project
+        :rtype: str
+
+        """
+        endpoint = self._endpoint.export_labels_url(project_id, self.__api_key)
+
+        response, content = await self._request(method="HEAD", endpoint=endpoint)
+
+        if self._response_valid(response, content):
+            return str(response.url)
+
+    async def _stream_media(self,
+                            media: Union[Image, Video],
+                            file: BinaryIO,
+                            chunk_size: int = STREAM_CHUNK_SIZE
+                            ) -> Optional[int]:
+        """ Download an Image or Video into a file-like object in chunks
+
+        :param media: The Image or Video
+        :param BinaryIO file: The file-like object the media is written to
+        :param int chunk_size: The number of bytes read at once
+        :returns: The number of bytes written, None in case of non-fatal exceptions
+        :rtype: int or None
+        """
+        session = self._get_session()
+        endpoint = self._endpoint.download_media(media.id, token=self.__api_key)
+        url, auth = self._endpoint.BASE_PATH + endpoint, self.__basic_auth
+
+        if isinstance(media, Video):
+            # Videos are served from a separate URL that the endpoint returns
+            response, content = await self._request(method="GET", endpoint=endpoint)
+            if not self._response_valid(response, content):
+                return None
+            url, auth = content.decode("utf-8"), None
+
+        async with self._semaphore:
+            async with session.get(url, auth=auth) as response:
+                # Only an error response is read at once, the media is streamed
+                if not response.ok and not self._response_valid(response, await response.read()):
+                    return None
+
+                written = 0
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    file.write(chunk)
+                    written += len(chunk)
+                return written
+
+    async def _download_media(self, media: Union[Image, Video], file_path: Union[str, Path], name: str) -> None:
+        """ Download an Image or Video via a '.part' file into a directory
+
+        :param media: The Image or Video
+        :param file_path: The destination directory
+        :param str name: The media name
+        """
+        path_file = Path(file_path).joinpath(name)
+        path_part = path_file.with_name(name + ".part")
+
+        try:
+            with open(path_part, 'wb') as handler:
+                written = await self._stream_media(media, handler)
+        except BaseException:
+            # Also on cancellation, a broken download never looks complete
+            path_part.unlink()
+            raise
+
+        if written is None:
+            path_part.unlink()
+        else:
+            os.replace(path_part, path_file)
+
+    async def download_image(self, image: Image, file_path: Union[str, Path]) -> None:
+        """ Download an Image and store it in a specific file path
+
+        :param Image image: The Image Object to be downloaded
+        :param file_path: The destination path for storing the Image
+
+        """
+        await self._download_media(image, file_path, image.image_name)
+
+    async def download_image_bytes(self, image: Image) -> bytes:
+        """ Download Image as a byte stream
+
+        :param Image image: Image object to be downloaded
+        :returns: Byte stream of the requested Image
+        :rtype: bytes
+
+        """
+        endpoint = self._endpoint.download_media(image.id, token=self.__api_key)
+
+        response, content = await self._request(method="GET", endpoint=endpoint)
+
+        if self._response_valid(response, content):
+            return content
+
+    async def download_video(self, video: Video, file_path: Union[str, Path]) -> None:
+        """ Download a Video and store it in a specific file path
+
+        :param Video video: The Video Object to be downloaded
+        :param file_path: The destination path for storing the Video
+
+        """
+        await self._download_media(video, file_path, video.video_name)
+
+    async def download_video_bytes(self, video: Video) -> bytes:
+        """ Download Video as a byte stream
+
+        :param Video video: The Video Object to be downloaded
+        :returns: Byte stream of the requested Video
+        :rtype: bytes
+
+        """
+        buffer = io.BytesIO()
+
+        if await self._stream_media(video, buffer) is not None:
+            return buffer.getvalue()
+
+    async def download_media_batch(self,
+                                   media: Iterable[Union[Image, Video]],
+                                   target_dir: Union[str, Path]
+                                   ) -> Dict[str, Union[DatagymException, OSError, None]]:
+        """ Download multiple Images or Videos concurrently into a directory
+
+        A failed download does not stop the others.
+
+        :param media: The Images or Videos to be downloaded
+        :param target_dir: The destination directory
+        :returns: Dictionary with { media_name : None if downloaded, else the raised exception, ...}
+        :rtype: Dict[str, Union[DatagymException, OSError, None]]
+
+        """
+        async def download(media_item):
+            name = media_item.video_name if isinstance(media_item, Video) else media_item.image_name
+            try:
+                await self._download_media(media_item, target_dir, name)
+                return name, None
+            except (DatagymException, aiohttp.ClientError, OSError) as e:
+                return name, e
+
+        return dict([result async for result in async_bounded_map(download, media, 2 * self._max_concurrency)])
+
+    async def create_dataset(self, name: str, short_description: str = None) -> Dataset:
+        """ Create Dataset in DataGym.io
+
+        :param str name: The name of the dataset
+        :param str short_description: An optional description of the Dataset
+        :returns: The newly created Dataset
+        :rtype: Dataset
+
+        """
+        data = {
+            "name": name,
+            "shortDescription": short_description
+        }
+        headers = {
+            'Content-type': 'application/json',
+            "Accept": "application/json",
+        }
+
+        response, content = await self._request(method="POST",
+                                                endpoint=self._endpoint.dataset(token=self.__api_key),
+                                                headers=headers,
+                                                json=data)
+
+        if self._response_valid(response, content):
+            return Dataset(json.loads(content))
+        else:  # In case of non-fatal exception
+            return await self.get_dataset_by_name(name)
+
+    async def add_dataset(self, dataset_id: str, project_id: str) -> bool:
+        """ Add a Dataset to a Project
+
+        :param dataset_id: The Dataset ID
+        :param project_id: The Project ID
+        :returns: True if Dataset was added successfully
+        :rtype: bool
+
+        """
+        endpoint = self._endpoint.add_dataset(project_id, dataset_id, token=self.__api_key)
+
+        response, content = await self._request(method="POST", endpoint=endpoint)
+
+        self._response_valid(response, content)
+        # Also True in case of non-fatal exception (already attached)
+        return True
+
+    async def remove_dataset(self, dataset_id: str, project_id: str) -> bool:
+        """ Remove a Dataset from a Project
+
+        :param str dataset_id: The Dataset ID
+        :param str project_id: The Project ID
+        :returns: True if Dataset was removed successfully
+        :rtype: bool
+
+        """
+        endpoint = self._endpoint.remove_dataset(project_id, dataset_id, token=self.__api_key)
+
+        response, content = await self._request(method="DELETE", endpoint=endpoint)
+
+        if self._response_valid(response, content):
+            return True
+
+    async def _post_in_batches(self,
+                               endpoint: str,
+                               items: Iterable,
+                               batch_size: int,
+                               stop_on_failure: bool = True,
+                               journal: Optional[BatchJournal] = None
+                               ) -> List:
+        """ Post items in concurrent mini batches and merge the responses in order
+
+        The items may be any iterable, ex. a generator. It is consumed
+        lazily, so only the mini batches in flight are kept in memory.
+
+        :param str endpoint: The DataGym API endpoint
+        :param Iterable items: The items to post
+        :param int batch_size: The number of items per request
+        :param bool stop_on_failure: Stop sending mini batches at the first batch with a non-fatal exception,
+            else skip the batch and continue. The mini batches already sent are still merged.
+        :param BatchJournal journal: Optional journal to skip and record completed mini batches
+        :returns: The concatenated responses of all successful mini batches
+        :rtype: List
+
+        """
+        stopped = False
+
+        def iter_batches():
+            for i, mini_batch in enumerate(chunked(items, batch_size)):
+                if stopped:
+                    return
+                yield i * batch_size, mini_batch
+
+        async def post_batch(batch):
+            offset, mini_batch = batch
+            entry = None
+            if journal is not None:
+                entry = (offset, len(mini_batch), journal.fingerprint(mini_batch))
+                if journal.is_completed(*entry):
+                    return None, []
+
+            partial_response, partial_content = await self._request(method="POST", endpoint=endpoint, json=mini_batch)
+
+            if self._response_valid(partial_response, partial_content):
+                return entry, json.loads(partial_content)
+            return entry, None
+
+        response = []
+        # Mini batches in flight are never cancelled, the server may already have applied them
+        partial_responses = async_bounded_map(post_batch, iter_batches(), 2 * self._max_concurrency,
+                                              cancel_pending=False)
+
+        try:
+            async for entry, partial_response in partial_responses:
+                if partial_response is not None:
+                    response += partial_response
+                    # Only mini batches whose responses reach the caller are recorded
+                    if entry is not None:
+                        journal.record(*entry)
+                elif stop_on_failure:
+                    # Send no further mini batches, but merge the ones already sent
+                    stopped = True
+        finally:
+            await partial_responses.aclose()
+
+        return response
+
+    async def create_images_from_urls(self,
+                                      dataset_id: str,
+                                      image_url_list: List[str],
+                                      batch_size: int = MAX_NUM_URLS_PER_UPLOAD,
+                                      stop_on_failure: bool = True
+                                      ) -> List[Dict[str, str]]:
+        """ Add Images to a Dataset from a list of URLs
+
+        :param dataset_id: The Dataset ID
+        :param image_url_list: A List of URLs referencing images
+        :param int batch_size: The number of URLs per request
+        :param bool stop_on_failure: Stop at the first mini batch with a non-fatal exception,
+            else continue with the remaining mini batches
+        :returns: A list of errors occurred during the Image upload
+        :rtype: List[Dict[str, str]]
+
+        """
+        endpoint = self._endpoint.create_image(dataset_id, token=self.__api_key)
+
+        return await self._post_in_batches(endpoint=endpoint,
+                                           items=image_url_list,
+                                           batch_size=batch_size,
+                                           stop_on_failure=stop_on_failure)
+
+    async def delete_image(self, image: Image) -> bool:
+        """ Deletes an Image from a Dataset
+
+        :param Image image: The Image to be deleted
+        :returns: True if Image was successfully deleted
+        :rtype: bool
+
+        """
+        endpoint = self._endpoint.delete_media(image.id, token=self.__api_key)
+
+        response, content = await self._request(method="DELETE", endpoint=endpoint)
+
+        if self._response_valid(response, content):
+            return True
+
+    async def import_label_data(self,
+                                project_id: str,
+                                label_data: Union[List[Dict], Iterable[Dict]],
+                                batch_size: int = MAX_NUM_URLS_PER_UPLOAD,
+                                checkpoint_file: Optional[Union[str, Path]] = None,
+                                stop_on_failure: bool = True
+                                ) -> List:
+        """ Import labeled image data into DataGym Projects
+
+        Behaves like :meth:`.Client.import_label_data`, the mini batches
+        are uploaded concurrently.
+
+        :param str project_id: Project_id of your project
+        :param label_data: Labels in JSON Format, as list or iterable. See DataGym Docs for more information
+        :param int batch_size: The number of labeled images per request
+        :param checkpoint_file: Optional path of the journal of completed mini batches
+        :param bool stop_on_failure: Stop at the first mini batch with a non-fatal exception,
+            else continue with the remaining mini batches
+        :returns: List of Errors if JSON is malformed or data is invalid
+        """
+        endpoint = self._endpoint.import_labels(project_id=project_id, token=self.__api_key)
+
+        if isinstance(label_data, Sized) and len(label_data) < batch_size and checkpoint_file is None:
+
+            response, content = await self._request(method="POST", endpoint=endpoint, json=label_data)
+
+            if self._response_valid(response, content):
+                return json.loads(content)
+        else:
+            journal = BatchJournal(checkpoint_file, batch_size) if checkpoint_file is not None else None
+
+            return await self._post_in_batches(endpoint=endpoint,
+                                               items=label_data,
+                                               batch_size=batch_size,
+                                               stop_on_failure=stop_on_failure,
+                                               journal=journal)
+
+    async def upload_image(self, dataset_id: str, image_path: str, image_name: str = None) -> Image or None:
+        """ Uploads an Image to a Dataset
+
+        :param str dataset_id: The dataset the image should be uploaded to
+        :param str image_path: The path to the image that should be uploaded
+        :param str image_name: Your prefered image name.
+                                If left empty, it will automatically be extracted from the image path
+        :returns: The Image if it was successfully uploaded, else None
+        :rtype: Image or None
+
+        """
+        endpoint = self._endpoint.upload_media(dataset_id, token=self.__api_key)
+
+        if not image_name:
+            image_name = os.path.basename(image_path)
+
+        headers = {
+            'X-filename': image_name,
+        }
+
+        with open(image_path, 'rb') as files:
+            response, content = await self._request(method="POST",
+                                                    endpoint=endpoint,
+                                                    headers=headers,
+                                                    data=files)
+
+        if self._response_valid(response, content):
+            return Image(json.loads(content))
+
+    async def upload_images(self,
+                            dataset_id: str,
+                            image_paths: Iterable[Union[str, Path]]
+                            ) -> Dict[str, Union[Image, DatagymException, OSError, None]]:
+        """ Uploads multiple Images to a Dataset concurrently
+
+        A failed upload does not stop the others, its exception is returned instead of the Image.
+
+        :param str dataset_id: The dataset the images should be uploaded to
+        :param image_paths: The paths to the images that should be uploaded
+        :returns: Dictionary with { image_path : Image, None (non-fatal exception) or the raised exception, ...}
+        :rtype: Dict[str, Union[Image, DatagymException, OSError, None]]
+
+        """
+        async def upload(image_path):
+            try:
+                return str(image_path), await self.upload_image(dataset_id, str(image_path))
+            except (DatagymException, aiohttp.ClientError, OSError) as e:
+                return str(image_path), e
+
+        return dict([result async for result in async_bounded_map(upload, image_paths, 2 * self._max_concurrency)])
@@ -1,21 +1,29 @@
+import io
 import os
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import json
 import logging
+import time
+from collections.abc import Sized
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, BinaryIO, Optional, Union
+from typing import List, Dict, BinaryIO, Optional, Union, Callable, Iterable, Iterator
 from .endpoints import Endpoint
 from .models import Project, Dataset, Image, Video
-from datagym.exceptions.exceptions import (APIException,
+from .models.dataset import MEDIA_MODELS
+from datagym.exceptions.exceptions import (DatagymException,
                                            InvalidTokenException,
-                                           ClientException,
-                                           ClientExceptionNonFatal,
-                                           ExceptionMessageBuilder)
+                                           ExceptionMessageBuilder,
+                                           validate_response)
 
+from datagym.utils.cache import TTLCache
+from datagym.utils.checkpoint import BatchJournal
+from datagym.utils.concurrency import bounded_map, chunked
+from datagym.utils.json_stream import JsonStreamReader, iter_json_array
 from datagym.utils.loadingbar import progressbar
-from datagym.constants import WARNING_KEYS
 
 
 class Client:
@@ -33,15 +41,27 @@ class Client:
     """
 
     MAX_NUM_URLS_PER_UPLOAD = 50
+    STREAM_CHUNK_SIZE = 64 * 1024
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_EXPORT_INDEX_TTL = 300
+    DEFAULT_MEDIA_PAGE_SIZE = 1000
+    METADATA_RESOURCES = ("projects", "datasets", "dataset")
     logger = logging.getLogger(__name__)
 
     def __init__(self, api_key: str, base_url: str = 'https://app.datagym.ai/',
-                 basic_auth: Optional[HTTPBasicAuth] = None) -> None:
+                 basic_auth: Optional[HTTPBasicAuth] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 export_index_ttl: float = DEFAULT_EXPORT_INDEX_TTL,
+                 metadata_ttl: Union[float, Dict[str, float]] = 0) -> None:
         """ Initializes DataGym Client instance
         
         :param base_url: URL to your Datagym instance
         :param str api_key: The API key of your organization
         :param Optional(HTTPBasicAuth) basic_auth: The basic authentification (username, password) for Datagym.ai
+        :param int pool_size: The maximum number of keep-alive connections kept open per host
+        :param float export_index_ttl: Seconds a downloaded Project export index is reused for single media exports
+        :param metadata_ttl: Seconds fetched Projects and Datasets are reused, 0 (default) disables the cache.
+            Either one value or a dictionary with the seconds per resource ('projects', 'datasets', 'dataset')
 
         """
         self._endpoint = Endpoint(base_path=base_url)
@@ -57,6 +77,31 @@ class Client:
 
         """
 
+        self._session = self._create_session(pool_size)
+        """An instance of :class:`requests.Session`.
+
+        Shared by all requests of this Client to reuse pooled keep-alive connections
+
+        """
+
+        self._export_index_cache = TTLCache(ttl=export_index_ttl)
+        """An instance of :class:`.TTLCache`.
+
+        Caches the media records of Project exports by Project ID
+
+        """
+
+        if not isinstance(metadata_ttl, dict):
+            metadata_ttl = dict.fromkeys(self.METADATA_RESOURCES, metadata_ttl)
+
+        self._metadata_cache = {resource: TTLCache(ttl=metadata_ttl.get(resource, 0))
+                                for resource in self.METADATA_RESOURCES}
+        """A :class:`.TTLCache` per metadata resource.
+
+        Caches the ETag and response body of the Project and Dataset endpoints by endpoint
+
+        """
+
         self.__api_key = api_key
         self.__basic_auth = basic_auth
 
@@ -66,6 +111,30 @@ class Client:
     def __str__(self):
         return self.__repr__()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """ Create a Session with a connection pool for HTTP and HTTPS
+
+        :param int pool_size: The maximum number of connections kept open per host
+        :returns: The configured Session
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self) -> None:
+        """ Close all pooled connections of this Client """
+        self._session.close()
+
     def _request(
             self,
             method: str,
@@ -73,7 +142,8 @@ class Client:
             headers: Optional[dict] = None,
             auth: Optional[HTTPBasicAuth] = None,
             json: Optional[Union[list, dict]] = None,
-            data: Optional[Union[BinaryIO, dict]] = None
+            data: Optional[Union[BinaryIO, dict]] = None,
+            stream: bool = False
     ) -> requests.Response:
         """ Send a HTTP request to a DataGym endpoint
 
@@ -83,6 +153,7 @@ class Client:
         :param HTTPBasicAuth auth: The basic authentification for this request.
         :param dict json: The request body as json
         :param dict data: The request body
+        :param bool stream: If True the response body is only downloaded when it is accessed
 
         :raises requests.exceptions.ConnectionError: Connection errors
 
@@ -91,22 +162,25 @@ class Client:
         """
         try:
             if json:
-                return requests.request(method=method,
-                                        url=self._endpoint.BASE_PATH + endpoint,
-                                        auth=auth,
-                                        headers=headers,
-                                        json=json)
+                return self._session.request(method=method,
+                                             url=self._endpoint.BASE_PATH + endpoint,
+                                             auth=auth,
+                                             headers=headers,
+                                             json=json,
+                                             stream=stream)
             elif data:
-                return requests.request(method=method,
-                                        url=self._endpoint.BASE_PATH + endpoint,
-                                        auth=auth,
-                                        headers=headers,
-                                        data=data)
+                return self._session.request(method=method,
+                                             url=self._endpoint.BASE_PATH + endpoint,
+                                             auth=auth,
+                                             headers=headers,
+                                             data=data,
+                                             stream=stream)
             else:
-                return requests.request(method=method,
-                                        url=self._endpoint.BASE_PATH + endpoint,
-                                        auth=auth,
-                                        headers=headers)
+                return self._session.request(method=method,
+                                             url=self._endpoint.BASE_PATH + endpoint,
+                                             auth=auth,
+                                             headers=headers,
+                                             stream=stream)
         except requests.exceptions.ConnectionError as e:
             raise e
         except requests.exceptions.RequestException as e:
@@ -119,21 +193,14 @@ class Client:
         :returns: True if response was successful
         :rtype: bool
         """
+        # The body of a successful response is not read here, it may be streamed
         if response.ok:
             return True
-        elif response.status_code == 500:
-            if response.content:
-                raise APIException(self._msg_builder, **json.loads(response.content))
-            else:
-                response.raise_for_status()
-        elif json.loads(response.content)["key"] in WARNING_KEYS:
-            ClientExceptionNonFatal(self._msg_builder, self.logger, **json.loads(response.content))
-            return False
-        else:
-            if response.content:
-                raise ClientException(self._msg_builder, **json.loads(response.content))
-            else:
-                response.raise_for_status()
+
+        valid = validate_response(self._msg_builder, self.logger, response.status_code, response.content)
+        if valid is None:
+            response.raise_for_status()
+        return valid
 
     def _is_token_valid(self) -> bool:
         response = self._request(method="HEAD",
@@ -148,6 +215,56 @@ class Client:
         else:
             return True
 
+    def _get_metadata(self, resource: str, endpoint: str) -> Optional[bytes]:
+        """ Fetch the response body of a Project or Dataset endpoint through the metadata cache
+
+        Cached bodies are reused for the metadata_ttl of the resource.
+        Expired bodies with an ETag are revalidated with a conditional
+        request, a '304 Not Modified' response reuses the cached body.
+
+        :param str resource: The metadata resource ('projects', 'datasets' or 'dataset')
+        :param str endpoint: The DataGym API endpoint
+        :returns: The response body, None in case of non-fatal exceptions
+        :rtype: bytes or None
+        """
+        cache = self._metadata_cache[resource]
+
+        cached, valid = cache.get_entry(endpoint)
+        if valid:
+            return cached[1]
+
+        etag = cached[0] if cached is not None else None
+        headers = {'If-None-Match': etag} if etag else None
+
+        response = self._request(method="GET",
+                                 endpoint=endpoint,
+                                 headers=headers,
+                                 auth=self.__basic_auth)
+
+        if etag and response.status_code == 304:
+            content = cached[1]
+        elif self._response_valid(response):
+            content = response.content
+            etag = response.headers.get('ETag')
+        else:
+            cache.invalidate(endpoint)
+            return None
+
+        cache.set(endpoint, (etag, content))
+        return content
+
+    def invalidate_metadata_cache(self, *resources: str) -> None:
+        """ Drop cached Projects and Datasets
+
+        The Client calls this after its own changes, call it after
+        changes made elsewhere (ex. in the DataGym web app).
+
+        :param resources: The metadata resources ('projects', 'datasets', 'dataset'), without resources all
+
+        """
+        for resource in resources or self.METADATA_RESOURCES:
+            self._metadata_cache[resource].invalidate()
+
     def _get_projects_without_images(self) -> List[Project]:
         """ Fetch all Projects with all Datasets but without Images
 
@@ -158,41 +275,44 @@ class Client:
         :rtype: List[Project]
 
         """
-        response = self._request(method="GET",
-                                 endpoint=self._endpoint.project(token=self.__api_key),
-                                 auth=self.__basic_auth)
+        content = self._get_metadata("projects", self._endpoint.project(token=self.__api_key))
 
-        if self._response_valid(response):
-            content = json.loads(response.content)
-            return [Project(project) for project in content]
+        if content is not None:
+            return [Project(project) for project in json.loads(content)]
 
     def get_projects(self) -> List[Project]:
         """ Fetch all Projects with all Datasets and Images
 
+        The Datasets of a Project are fetched with their Images by ID
+        when Project.datasets is accessed for the first time, so only
+        the Datasets of the Projects in use are downloaded.
+
         :returns: A List of all Projects from your organization
         :rtype: List[Project]
 
         """
         projects = self._get_projects_without_images()
-        datasets = self.get_datasets()
 
         for project in projects:
-            project.update_existing_datasets(datasets)
+            project.set_dataset_loader(self.get_dataset_by_id)
 
         return projects
 
     def get_project_by_name(self, project_name: str) -> Project or None:
         """ Fetch Project by its name from DataGym
 
+        Only the Datasets of the matching Project are fetched.
+
         :param str project_name: The Project name
         :returns: The Project with the given name
         :rtype: Project or None
 
         """
-        projects = self.get_projects()
+        projects = self._get_projects_without_images()
 
         for project in projects:
             if project.name == project_name:
+                project.datasets = [self.get_dataset_by_id(d.id) or d for d in project.datasets]
                 return project
 
         return None
@@ -204,13 +324,25 @@ class Client:
         :rtype: List[Dataset]
 
         """
-        response = self._request(method="GET",
-                                 endpoint=self._endpoint.dataset(token=self.__api_key),
-                                 auth=self.__basic_auth)
+        content = self._get_metadata("datasets", self._endpoint.dataset(token=self.__api_key))
 
-        if self._response_valid(response):
-            content = json.loads(response.content)
-            return [Dataset(dataset) for dataset in content]
+        if content is not None:
+            return [Dataset(dataset) for dataset in json.loads(content)]
+
+    def get_dataset_by_id(self, dataset_id: str) -> Dataset or None:
+        """ Fetch Dataset with all Images by its ID from DataGym
+
+        :param str dataset_id: The Dataset ID
+        :returns: The Dataset with the given ID
+        :rtype: Dataset or None
+
+        """
+        content = self._get_metadata("dataset", self._endpoint.get_dataset_by_id(dataset_id, token=self.__api_key))
+
+        if content is not None:
+            return Dataset(json.loads(content))
+
+        return None
 
     def get_dataset_by_name(self, dataset_name: str) -> Dataset or None:
         """ Fetch Dataset by its name from DataGym
@@ -228,10 +360,203 @@ class Client:
 
         return None
 
-    def export_labels(self, project_id: str) -> Dict:
+    def iter_dataset_media(self,
+                           dataset_id: str,
+                           page_size: int = DEFAULT_MEDIA_PAGE_SIZE
+                           ) -> Iterator[List[Union[Image, Video]]]:
+        """ Fetch the media of a Dataset page by page
+
+        The DataGym API returns a Dataset with all its media in one
+        response. The response is streamed and parsed while it arrives,
+        so the first pages are yielded before the download is complete
+        and only one page of media is kept in memory at a time.
+
+        :param str dataset_id: The Dataset ID
+        :param int page_size: The number of Images or Videos per page
+        :returns: Iterator over lists of at most page_size Images or Videos
+        :rtype: Iterator[List[Image|Video]]
+
+        """
+        pages = self._open_dataset_media(dataset_id, page_size)
+
+        if pages is not None:
+            yield from pages
+
+    def _open_dataset_media(self, dataset_id: str, page_size: int) -> Optional[Iterator[List[Union[Image, Video]]]]:
+        """ Request the media of a Dataset for iter_dataset_media
+
+        :param str dataset_id: The Dataset ID
+        :param int page_size: The number of Images or Videos per page
+        :returns: Iterator over the media pages, None in case of non-fatal exceptions
+        :rtype: Iterator[List[Image|Video]] or None
+        """
+        endpoint = self._endpoint.get_dataset_by_id(dataset_id, token=self.__api_key)
+
+        response = self._request(method="GET",
+                                 endpoint=endpoint,
+                                 auth=self.__basic_auth,
+                                 stream=True)
+
+        try:
+            valid = self._response_valid(response)
+        except BaseException:
+            response.close()
+            raise
+
+        if not valid:
+            response.close()
+            return None
+
+        return self._iter_media_pages(response, page_size)
+
+    def _iter_media_pages(self, response: requests.Response, page_size: int) -> Iterator[List[Union[Image, Video]]]:
+        """ Parse the streamed response of the dataset-by-id endpoint into media pages
+
+        :param requests.Response response: The streamed response
+        :param int page_size: The number of Images or Videos per page
+        :returns: Iterator over the media pages
+        :rtype: Iterator[List[Image|Video]]
+        """
+        try:
+            media_type = None
+            # Pages that arrive before the media type are held back until it is known
+            pending_pages = []
+
+            dataset = JsonStreamReader(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE))
+            for key, value in dataset.iter_object():
+                if key == "mediaType":
+                    if value not in MEDIA_MODELS:
+                        # Like Dataset.media, other media types have no Images or Videos
+                        return
+                    media_type = value
+                    for page in pending_pages:
+                        yield self._build_media_page(media_type, page)
+                    pending_pages = []
+                elif key == "media" and value is not None:
+                    for page in chunked(value, page_size):
+                        if media_type is None:
+                            pending_pages.append(page)
+                        else:
+                            yield self._build_media_page(media_type, page)
+        finally:
+            response.close()
+
+    @staticmethod
+    def _build_media_page(media_type: str, page: List[Dict]) -> List[Union[Image, Video]]:
+        """ Build the Images or Videos of a media page
+
+        :param str media_type: The media type of the Dataset, 'IMAGE' or 'VIDEO'
+        :param List[Dict] page: The raw media data
+        :returns: List of Images or Videos
+        :rtype: List[Image|Video]
+        """
+        return list(map(MEDIA_MODELS[media_type], page))
+
+    def sync_dataset(self,
+                     dataset_id: str,
+                     state_file: Union[str, Path],
+                     page_size: int = DEFAULT_MEDIA_PAGE_SIZE
+                     ) -> Optional[Dict[str, List]]:
+        """ Find the media of a Dataset that was added, changed or removed since the last sync
+
+        The state_file keeps a snapshot of the media IDs and timestamps
+        of the last sync. The media is streamed with iter_dataset_media
+        and compared against the snapshot page by page, so only the
+        changed media is kept. The new snapshot replaces the state_file
+        once the whole Dataset was read. Without a state_file all media
+        is reported as added.
+
+        :param str dataset_id: The Dataset ID
+        :param state_file: Path of the JSON snapshot of the last sync
+        :param int page_size: The number of Images or Videos per page
+        :returns: Dictionary with the 'added' and 'changed' Images or Videos and the 'removed' media IDs,
+            None in case of non-fatal exceptions
+        :rtype: Dict[str, List] or None
+
+        """
+        state_file = Path(state_file)
+
+        previous = {}
+        if state_file.is_file():
+            with open(state_file) as handler:
+                state = json.load(handler)
+            if state["dataset_id"] != dataset_id:
+                raise ValueError(f'The state file "{state_file}" belongs to the Dataset {state["dataset_id"]}')
+            previous = state["media"]
+
+        pages = self._open_dataset_media(dataset_id, page_size)
+        if pages is None:
+            return None
+
+        diff = {"added": [], "changed": [], "removed": []}
+        current = {}
+
+        for page in pages:
+            for media in page:
+                current[media.id] = media.timestamp
+                if media.id not in previous:
+                    diff["added"].append(media)
+                elif previous.pop(media.id) != media.timestamp:
+                    diff["changed"].append(media)
+
+        # The media that is left in the previous snapshot was not listed anymore
+        diff["removed"] = list(previous)
+
+        # Write next to the state file first, so an interrupted write keeps the last snapshot
+        path_part = state_file.with_name(state_file.name + ".part")
+        with open(path_part, 'w') as handler:
+            json.dump({"dataset_id": dataset_id, "media": current}, handler)
+        os.replace(path_part, state_file)
+
+        return diff
+
+    def _map(self, fn: Callable, iterable: Iterable, max_workers: int = 1) -> Iterator:
+        """ Call fn for every item and yield the results in input order
+
+        With more than one worker the calls run on a thread pool that
+        keeps at most 2 * max_workers calls in flight.
+
+        :param Callable fn: The function to call for each item
+        :param Iterable iterable: The items
+        :param int max_workers: The number of concurrent calls
+        :returns: Iterator over the results of fn
+        :rtype: Iterator
+        """
+        if max_workers <= 1:
+            for item in iterable:
+                yield fn(item)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                yield from bounded_map(executor, fn, iterable, 2 * max_workers)
+
+    def _fetch_task_labels(self, media_export: Dict) -> Dict:
+        """ Fetch the labels of a single media export and add them in place
+
+        :param Dict media_export: A media entry of the project export
+        :returns: The media entry with its 'labels'
+        :rtype: Dict
+
+        """
+        if 'task_export_url' in media_export:
+            # Remove the beginning to leave only endpoint
+            inner_endpoint = media_export['task_export_url'].replace(self._endpoint.BASE_PATH, "")
+
+            inner_response = self._request(method="GET",
+                                           endpoint=inner_endpoint,
+                                           auth=self.__basic_auth)
+
+            if self._response_valid(inner_response):
+                temp_label = json.loads(inner_response.content)
+
+                media_export['labels'] = temp_label
+        return media_export
+
+    def export_labels(self, project_id: str, max_workers: int = 1) -> Dict:
         """ Export the labeled data from a specific Project
 
         :param str project_id: The Project ID
+        :param int max_workers: The number of task labels fetched concurrently.
+            Values above the Client's pool_size do not add throughput.
         :returns: The labeled data as Dictionary
         :rtype: Dict
 
@@ -246,58 +571,100 @@ class Client:
 
             export_dict = json.loads(response.content)
 
-            for media_export in export_dict[1:]:
-                if 'task_export_url' in media_export:
-                    # Remove the beginning to leave only endpoint
-                    inner_endpoint = media_export['task_export_url'].replace(self._endpoint.BASE_PATH, "")
-
-                    inner_response = self._request(method="GET",
-                                                   endpoint=inner_endpoint,
-                                                   auth=self.__basic_auth)
-
-                    if self._response_valid(inner_response):
-                        temp_label = json.loads(inner_response.content)
-
-                        media_export['labels'] = temp_label
+            for _ in self._map(self._fetch_task_labels, export_dict[1:], max_workers):
+                pass
             return export_dict
         else:
             return dict()
 
-    def export_single_video_labels(self, project_id: str, video_id: str) -> Dict:
-        """ Export the labeled data from a specific Video
+    def _iter_export_records(self, project_id: str) -> Iterator[Dict]:
+        """ Stream the media records of a Project export without their labels
 
         :param str project_id: The Project ID
-        :param str video_id: The Video ID
-        :returns: The labeled data as Dictionary
-        :rtype: Dict
+        :returns: Iterator over the media exports
+        :rtype: Iterator[Dict]
 
         """
         endpoint = self._endpoint.export_labels(project_id, token=self.__api_key)
 
         response = self._request(method="GET",
                                  endpoint=endpoint,
-                                 auth=self.__basic_auth)
+                                 auth=self.__basic_auth,
+                                 stream=True)
 
-        if self._response_valid(response):
+        try:
+            if self._response_valid(response):
+                media_exports = iter_json_array(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE))
+                # The first entry describes the export itself, like in export_labels
+                next(media_exports, None)
 
-            export_dict = json.loads(response.content)
+                yield from media_exports
+        finally:
+            response.close()
+
+    def iter_export_labels(self, project_id: str, max_workers: int = 1) -> Iterator[Dict]:
+        """ Export the labeled data from a specific Project media by media
+
+        The project export is parsed while it is downloaded and the labels
+        of each media are only fetched when the media is reached, so the
+        memory usage does not grow with the size of the Project.
+
+        :param str project_id: The Project ID
+        :param int max_workers: The number of task labels fetched ahead concurrently
+        :returns: Iterator over the media exports with their labels
+        :rtype: Iterator[Dict]
+
+        """
+        yield from self._map(self._fetch_task_labels, self._iter_export_records(project_id), max_workers)
+
+    def _get_export_index(self, project_id: str) -> Dict[str, Dict]:
+        """ Get the media records of a Project export indexed by media ID
+
+        The index is cached for export_index_ttl seconds.
+
+        :param str project_id: The Project ID
+        :returns: Dictionary with { internal_media_ID : media export without labels, ...}
+        :rtype: Dict[str, Dict]
+
+        """
+        export_index = self._export_index_cache.get(project_id)
+
+        if export_index is None:
+            export_index = {media_export['internal_media_ID']: media_export
+                            for media_export in self._iter_export_records(project_id)}
+            if export_index:
+                self._export_index_cache.set(project_id, export_index)
+
+        return export_index
+
+    def invalidate_export_index(self, project_id: str = None) -> None:
+        """ Drop the cached export index of a Project
+
+        :param str project_id: The Project ID, if left empty the index of every Project is dropped
+
+        """
+        self._export_index_cache.invalidate(project_id)
 
-            for media_export in export_dict[1:]:
-                if media_export['internal_media_ID'] == video_id:
-                    if 'task_export_url' in media_export:
-                        # Remove the beginning to leave only endpoint
-                        inner_endpoint = media_export['task_export_url'].replace(self._endpoint.BASE_PATH, "")
-                        inner_response = self._request(method="GET",
-                                                       endpoint=inner_endpoint,
-                                                       auth=self.__basic_auth)
+    def export_single_video_labels(self, project_id: str, video_id: str) -> Dict:
+        """ Export the labeled data from a specific Video
 
-                        if self._response_valid(inner_response):
-                            temp_label = json.loads(inner_response.content)
-                            media_export['labels'] = temp_label
-                    return media_export
+        The Project export is only downloaded once per export_index_ttl,
+        repeated calls just fetch the labels of the requested Video.
+
+        :param str project_id: The Project ID
+        :param str video_id: The Video ID
+        :returns: The labeled data as Dictionary
+        :rtype: Dict
 
+        """
+        media_export = self._get_export_index(project_id).get(video_id)
+
+        if media_export is None:
             return dict()
 
+        # Copy the record to keep the labels out of the cached index
+        return self._fetch_task_labels(dict(media_export))
+
     def export_labels_url(self, project_id: str) -> str:
         """ Generate a URL to the labeled data from a specific Project
 
@@ -315,19 +682,84 @@ class Client:
         if self._response_valid(response):
             return response.url
 
-    def download_video(self, video: Video, file_path: str) -> None:
+    def download_video(self,
+                       video: Video,
+                       file_path: str,
+                       chunk_size: int = STREAM_CHUNK_SIZE,
+                       resume: bool = True
+                       ) -> None:
         """ Download a Video and store it in a specific file path
 
+        The Video is streamed to a '.part' file next to the destination in
+        chunks and renamed once it is complete. If resume is True and a
+        '.part' file of an interrupted download exists, only the missing
+        bytes are requested. A '.part' file longer than the Video is
+        replaced by a new download.
+
         :param Video video: The Video Object to be downloaded
         :param file_path: The destination path for storing the Video
+        :param int chunk_size: The number of bytes written at once
+        :param bool resume: Continue an interrupted download of this Video
 
         """
-        video_content = self.download_video_bytes(video)
-        if video_content:
-            path_dir = Path(file_path)
-            path_file = path_dir.joinpath(video.video_name)
-            with open(path_file, 'wb') as handler:
-                handler.write(video_content)
+        path_dir = Path(file_path)
+        path_file = path_dir.joinpath(video.video_name)
+        path_part = path_dir.joinpath(video.video_name + ".part")
+
+        offset = path_part.stat().st_size if resume and path_part.is_file() else 0
+
+        with open(path_part, 'ab' if offset else 'wb') as handler:
+            written = self.download_video_stream(video, handler, chunk_size=chunk_size, offset=offset)
+
+        if written is None:
+            # Non-fatal exception, do not leave an empty file behind
+            if not offset:
+                path_part.unlink()
+        else:
+            os.replace(path_part, path_file)
+
+    def download_video_stream(self,
+                              video: Video,
+                              file: BinaryIO,
+                              chunk_size: int = STREAM_CHUNK_SIZE,
+                              offset: int = 0
+                              ) -> Optional[int]:
+        """ Download a Video into a file-like object in chunks
+
+        If the bytes already received are longer than the Video, they
+        belong to another Video. The file is truncated then and the
+        Video is downloaded from scratch.
+
+        :param Video video: The Video Object to be downloaded
+        :param BinaryIO file: The file-like object the Video is written to
+        :param int chunk_size: The number of bytes written at once
+        :param int offset: The number of bytes already received, the download continues after them
+        :returns: The number of bytes written, None in case of non-fatal exceptions
+        :rtype: int or None
+
+        """
+        response = self._open_media_stream(video, offset=offset)
+
+        if response is None:
+            return None
+
+        with response:
+            if offset and response.status_code == 416:
+                if response.headers.get('Content-Range') == f'bytes */{offset}':
+                    # The requested range starts at the end of the Video, nothing is missing
+                    return 0
+
+                if not file.seekable():
+                    self.logger.warning("The %d bytes received do not belong to Video %s", offset, video.id)
+                    return None
+
+                file.seek(0)
+                file.truncate()
+                return self.download_video_stream(video, file, chunk_size=chunk_size)
+
+            # Servers without range support send the whole Video, its beginning is dropped then
+            skip = offset if response.status_code != 206 else 0
+            return self._stream_to_file(response, file, chunk_size, skip=skip)
 
     def download_video_bytes(self, video: Video) -> bytes:
         """ Download a Video and store it in a specific file path
@@ -337,18 +769,10 @@ class Client:
         :rtype: bytes
 
         """
-        endpoint = self._endpoint.download_media(video.id, token=self.__api_key)
-
-        response = self._request(method="GET",
-                                 endpoint=endpoint,
-                                 auth=self.__basic_auth)
-
-        if self._response_valid(response):
-            inner_response = requests.request(method="GET",
-                                              url=response.content.decode("utf-8"))
+        buffer = io.BytesIO()
 
-            if self._response_valid(inner_response):
-                return inner_response.content
+        if self.download_video_stream(video, buffer) is not None:
+            return buffer.getvalue()
 
     def download_image(self, image: Image, file_path: str) -> None:
         """ Download an Image and store it in a specific file path
@@ -387,6 +811,168 @@ class Client:
         if self._response_valid(response):
             return response.content
 
+    @staticmethod
+    def _media_name(media: Union[Image, Video]) -> str:
+        """ Get the file name of an Image or Video
+
+        :param media: The Image or Video
+        :returns: The media name
+        :rtype: str
+        """
+        return media.video_name if isinstance(media, Video) else media.image_name
+
+    def _open_media_stream(self, media: Union[Image, Video], offset: int = 0) -> Optional[requests.Response]:
+        """ Request the content of an Image or Video without downloading it yet
+
+        :param media: The Image or Video
+        :param int offset: Request only the bytes from this offset on (HTTP range request)
+        :returns: The streamed response with the media bytes, None in case of non-fatal exceptions
+        :rtype: requests.Response or None
+        """
+        endpoint = self._endpoint.download_media(media.id, token=self.__api_key)
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+
+        if isinstance(media, Video):
+            # Videos are served from a separate URL that the endpoint returns
+            response = self._request(method="GET",
+                                     endpoint=endpoint,
+                                     auth=self.__basic_auth)
+
+            if self._response_valid(response):
+                inner_response = self._session.request(method="GET",
+                                                       url=response.content.decode("utf-8"),
+                                                       headers=headers,
+                                                       stream=True)
+                if (offset and inner_response.status_code == 416) or self._response_valid(inner_response):
+                    return inner_response
+        else:
+            response = self._request(method="GET",
+                                     endpoint=endpoint,
+                                     headers=headers,
+                                     auth=self.__basic_auth,
+                                     stream=True)
+
+            if (offset and response.status_code == 416) or self._response_valid(response):
+                return response
+
+        return None
+
+    def _get_media_size(self, media: Union[Image, Video]) -> Optional[int]:
+        """ Request the size of an Image or Video without downloading it (HTTP HEAD request)
+
+        :param media: The Image or Video
+        :returns: The size in bytes, None if the server does not report it
+        :rtype: int or None
+        """
+        endpoint = self._endpoint.download_media(media.id, token=self.__api_key)
+
+        if isinstance(media, Video):
+            # Videos are served from a separate URL that the endpoint returns
+            response = self._request(method="GET",
+                                     endpoint=endpoint,
+                                     auth=self.__basic_auth)
+
+            if not self._response_valid(response):
+                return None
+            response = self._session.request(method="HEAD", url=response.content.decode("utf-8"))
+        else:
+            response = self._request(method="HEAD",
+                                     endpoint=endpoint,
+                                     auth=self.__basic_auth)
+
+        size = response.headers.get('Content-Length')
+        return int(size) if response.ok and size is not None else None
+
+    def _stream_to_file(self, response: requests.Response, file: BinaryIO, chunk_size: int, skip: int = 0) -> int:
+        """ Write a streamed response to a file chunk by chunk
+
+        :param requests.Response response: The streamed response
+        :param BinaryIO file: The file opened for binary writing
+        :param int chunk_size: The number of bytes read at once
+        :param int skip: The number of leading bytes that are not written
+        :returns: The number of bytes written
+        :rtype: int
+        """
+        written = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if skip:
+                if len(chunk) <= skip:
+                    skip -= len(chunk)
+                    continue
+                chunk = chunk[skip:]
+                skip = 0
+            file.write(chunk)
+            written += len(chunk)
+        return written
+
+    def download_media_batch(self,
+                             media: Iterable[Union[Image, Video]],
+                             target_dir: Union[str, Path],
+                             max_workers: int = 4,
+                             chunk_size: int = STREAM_CHUNK_SIZE
+                             ) -> Dict:
+        """ Download multiple Images or Videos concurrently into a directory
+
+        The media is streamed to disk in chunks. Files that already exist
+        with the size of the media are skipped, their size is checked with a
+        HEAD request, so an interrupted batch can simply be started again. A failed download does not stop the others.
+
+        :param media: The Images or Videos to be downloaded
+        :param target_dir: The destination directory
+        :param int max_workers: The number of concurrent downloads
+        :param int chunk_size: The number of bytes written at once
+        :returns: Dictionary with the 'downloaded' and 'skipped' media names,
+            the 'failed' media names with their exception (None for non-fatal exceptions),
+            the downloaded 'bytes', the elapsed 'seconds' and the throughput in 'bytes_per_second'
+        :rtype: Dict
+
+        """
+        target_dir = Path(target_dir)
+        media = list(media)
+
+        def download(media_item):
+            name = self._media_name(media_item)
+            path_file = target_dir.joinpath(name)
+            try:
+                # Only the size is requested for existing files, their content is not downloaded again
+                if path_file.is_file() and path_file.stat().st_size == self._get_media_size(media_item):
+                    return name, "skipped", 0
+
+                response = self._open_media_stream(media_item)
+                if response is None:
+                    return name, "failed", None
+
+                with response:
+                    # Write next to the target first, so a broken download never looks complete
+                    path_part = path_file.with_name(name + ".part")
+                    with open(path_part, 'wb') as handler:
+                        written = self._stream_to_file(response, handler, chunk_size)
+                    os.replace(path_part, path_file)
+
+                return name, "downloaded", written
+            except (DatagymException, requests.exceptions.RequestException, OSError) as e:
+                return name, "failed", e
+
+        report = {"downloaded": [], "skipped": [], "failed": {}, "bytes": 0}
+        start = time.monotonic()
+
+        for name, status, result in progressbar(self._map(download, media, max_workers),
+                                                "Downloading media: ", 40, total=len(media)):
+            if status == "failed":
+                report["failed"][name] = result
+            else:
+                report[status].append(name)
+                report["bytes"] += result
+
+        report["seconds"] = time.monotonic() - start
+        report["bytes_per_second"] = report["bytes"] / report["seconds"] if report["seconds"] > 0 else 0.0
+
+        self.logger.info("Downloaded %d media (%d skipped, %d failed), %.2f MB/s",
+                         len(report["downloaded"]), len(report["skipped"]), len(report["failed"]),
+                         report["bytes_per_second"] / 1e6)
+
+        return report
+
     def create_dataset(
             self,
             name: str,
@@ -415,6 +1001,8 @@ class Client:
                                  auth=self.__basic_auth,
                                  json=data)
 
+        self.invalidate_metadata_cache("datasets")
+
         if self._response_valid(response):
             return Dataset(json.loads(response.content))
         else:  # In case of non-fatal exception
@@ -435,6 +1023,9 @@ class Client:
                                  endpoint=endpoint,
                                  auth=self.__basic_auth)
 
+        self.invalidate_export_index(project_id)
+        self.invalidate_metadata_cache("projects")
+
         if self._response_valid(response):
             return True
         else:  # In case of non-fatal exception (already attached)
@@ -455,24 +1046,112 @@ class Client:
                                  endpoint=endpoint,
                                  auth=self.__basic_auth)
 
+        self.invalidate_export_index(project_id)
+        self.invalidate_metadata_cache("projects")
+
         if self._response_valid(response):
             return True
 
+    def _post_in_batches(self,
+                         endpoint: str,
+                         items: Iterable,
+                         prefix: str,
+                         batch_size: int,
+                         max_workers: int = 1,
+                         stop_on_failure: bool = True,
+                         journal: Optional[BatchJournal] = None
+                         ) -> List:
+        """ Post items in mini batches and merge the responses in order
+
+        The items may be any iterable, ex. a generator. It is consumed
+        lazily, so only the mini batches in flight are kept in memory.
+
+        :param str endpoint: The DataGym API endpoint
+        :param Iterable items: The items to post
+        :param str prefix: The progressbar prefix
+        :param int batch_size: The number of items per request
+        :param int max_workers: The number of mini batches in flight at once
+        :param bool stop_on_failure: Stop sending mini batches at the first batch with a non-fatal exception,
+            else skip the batch and continue. The mini batches already sent are still merged.
+        :param BatchJournal journal: Optional journal to skip and record completed mini batches
+        :returns: The concatenated responses of all successful mini batches
+        :rtype: List
+
+        """
+        stopped = False
+
+        def iter_batches():
+            for i, mini_batch in enumerate(chunked(items, batch_size)):
+                if stopped:
+                    return
+                yield i * batch_size, mini_batch
+
+        def post_batch(batch):
+            offset, mini_batch = batch
+            entry = None
+            if journal is not None:
+                entry = (offset, len(mini_batch), journal.fingerprint(mini_batch))
+                if journal.is_completed(*entry):
+                    return None, []
+
+            partial_response = self._request(method="POST",
+                                             endpoint=endpoint,
+                                             auth=self.__basic_auth,
+                                             json=mini_batch)
+
+            if self._response_valid(partial_response):
+                return entry, json.loads(partial_response.content)
+            return entry, None
+
+        response = []
+        partial_responses = self._map(post_batch, iter_batches(), max_workers)
+
+        if isinstance(items, Sized):
+            progress = progressbar(partial_responses, prefix, 40, total=-(-len(items) // batch_size))
+        else:
+            progress = partial_responses
+
+        try:
+            for entry, partial_response in progress:
+                if partial_response is not None:
+                    response += partial_response
+                    # Only mini batches whose responses reach the caller are recorded
+                    if entry is not None:
+                        journal.record(*entry)
+                elif stop_on_failure:
+                    # Send no further mini batches, but merge the ones already sent
+                    stopped = True
+        finally:
+            # Cancel the mini batches that are still queued
+            partial_responses.close()
+
+        return response
+
     def create_images_from_urls(self,
                                 dataset_id: str,
-                                image_url_list: List[str]
+                                image_url_list: List[str],
+                                batch_size: int = MAX_NUM_URLS_PER_UPLOAD,
+                                max_workers: int = 1,
+                                stop_on_failure: bool = True
                                 ) -> List[Dict[str, str]]:
         """ Add Images to a Dataset from a list of URLs
 
         :param dataset_id: The Dataset ID
         :param image_url_list: A List of URLs referencing images
+        :param int batch_size: The number of URLs per request
+        :param int max_workers: The number of requests in flight at once
+        :param bool stop_on_failure: Stop at the first mini batch with a non-fatal exception,
+            else continue with the remaining mini batches
         :returns: A list of errors occurred during the Image upload
         :rtype: List[Dict[str, str]]
 
         """
         endpoint = self._endpoint.create_image(dataset_id, token=self.__api_key)
 
-        if len(image_url_list) < self.MAX_NUM_URLS_PER_UPLOAD:
+        # The Dataset media changes, also if only some of the mini batches succeed
+        self.invalidate_metadata_cache("datasets", "dataset")
+
+        if len(image_url_list) < batch_size:
 
             response = self._request(method="POST",
                                      endpoint=endpoint,
@@ -482,29 +1161,12 @@ class Client:
                 return json.loads(response.content)
         # If the url List contains a large number of urls it is split into mini batches for upload
         else:
-            response = []
-
-            for i in progressbar(
-                    range(0, len(image_url_list), self.MAX_NUM_URLS_PER_UPLOAD),
-                    "Uploading image urls: ",
-                    40
-            ):
-                if i + self.MAX_NUM_URLS_PER_UPLOAD >= len(image_url_list):
-                    slice = image_url_list[i:]
-                else:
-                    slice = image_url_list[i:i + self.MAX_NUM_URLS_PER_UPLOAD]
-
-                partial_response = self._request(method="POST",
-                                                 endpoint=endpoint,
-                                                 auth=self.__basic_auth,
-                                                 json=slice)
-
-                if self._response_valid(partial_response):
-                    response += json.loads(partial_response.content)
-                else:
-                    break
-
-            return response
+            return self._post_in_batches(endpoint=endpoint,
+                                         items=image_url_list,
+                                         prefix="Uploading image urls: ",
+                                         batch_size=batch_size,
+                                         max_workers=max_workers,
+                                         stop_on_failure=stop_on_failure)
 
     def delete_image(self, image: Image) -> bool:
         """ Deletes an Image from a Dataset
@@ -520,20 +1182,46 @@ class Client:
                                  endpoint=endpoint,
                                  auth=self.__basic_auth)
 
+        self.invalidate_metadata_cache("datasets", "dataset")
+
         if self._response_valid(response):
             return True
 
-    def import_label_data(self, project_id: str, label_data: Dict) -> List:
+    def import_label_data(self,
+                          project_id: str,
+                          label_data: Union[List[Dict], Iterable[Dict]],
+                          batch_size: int = MAX_NUM_URLS_PER_UPLOAD,
+                          max_workers: int = 1,
+                          checkpoint_file: Optional[Union[str, Path]] = None,
+                          stop_on_failure: bool = True
+                          ) -> List:
         """ Import labeled image data into DataGym Projects
 
+        With a checkpoint_file every completed mini batch is recorded in a
+        local journal. Running the same import with the same checkpoint_file
+        again skips the recorded mini batches, so an interrupted import
+        resumes where it stopped. Errors of skipped mini batches are not
+        returned again. The journal only matches the same batch_size and
+        label_data, else a ValueError is raised. Delete the file to start
+        a new import from scratch.
+
+        Instead of a list, label_data can be any iterable of labeled images,
+        ex. Coco.iter_datagym_labels. It is read in mini batches while
+        uploading, so the labels never have to be in memory at once.
+
         :param str project_id: Project_id of your project,
             use client.get_project_by_name(project_name=PROJECT_NAME).id to get the id for your project
-        :param Dict label_data: Labels in JSON Format. See DataGym Docs for more information
+        :param label_data: Labels in JSON Format, as list or iterable. See DataGym Docs for more information
+        :param int batch_size: The number of labeled images per request
+        :param int max_workers: The number of mini batches in flight at once
+        :param checkpoint_file: Optional path of the journal of completed mini batches
+        :param bool stop_on_failure: Stop at the first mini batch with a non-fatal exception,
+            else continue with the remaining mini batches
         :returns: List of Errors if JSON is malformed or data is invalid
         """
         endpoint = self._endpoint.import_labels(project_id=project_id, token=self.__api_key)
 
-        if len(label_data) < self.MAX_NUM_URLS_PER_UPLOAD:
+        if isinstance(label_data, Sized) and len(label_data) < batch_size and checkpoint_file is None:
 
             response = self._request(method="POST",
                                      endpoint=endpoint,
@@ -544,29 +1232,15 @@ class Client:
                 return json.loads(response.content)
         # If the label List contains a large number of labeled images it is split into mini batches for upload
         else:
-            response = []
-
-            for i in progressbar(
-                    range(0, len(label_data), self.MAX_NUM_URLS_PER_UPLOAD),
-                    "Uploading annotations: ",
-                    40
-            ):
-                if i + self.MAX_NUM_URLS_PER_UPLOAD >= len(label_data):
-                    mini_batch = label_data[i:]
-                else:
-                    mini_batch = label_data[i:i + self.MAX_NUM_URLS_PER_UPLOAD]
-
-                partial_response = self._request(method="POST",
-                                                 endpoint=endpoint,
-                                                 auth=self.__basic_auth,
-                                                 json=mini_batch)
-
-                if self._response_valid(partial_response):
-                    response += json.loads(partial_response.content)
-                else:
-                    break
-
-            return response
+            journal = BatchJournal(checkpoint_file, batch_size) if checkpoint_file is not None else None
+
+            return self._post_in_batches(endpoint=endpoint,
+                                         items=label_data,
+                                         prefix="Uploading annotations: ",
+                                         batch_size=batch_size,
+                                         max_workers=max_workers,
+                                         stop_on_failure=stop_on_failure,
+                                         journal=journal)
 
     def upload_image(self, dataset_id: str, image_path: str, image_name: str = None) -> Image or None:
         """ Uploads an Image to a Dataset
@@ -584,21 +1258,73 @@ class Client:
         if not image_name:
             image_name = os.path.basename(image_path)
 
-        files = open(image_path, 'rb')
-
         headers = {
             'X-filename': image_name,
         }
 
-        response = self._request(method="POST",
-                                 endpoint=endpoint,
-                                 headers=headers,
-                                 auth=self.__basic_auth,
-                                 data=files)
+        # The open file is passed as body, so it is streamed from disk instead of read into memory
+        with open(image_path, 'rb') as files:
+            response = self._request(method="POST",
+                                     endpoint=endpoint,
+                                     headers=headers,
+                                     auth=self.__basic_auth,
+                                     data=files)
+
+        self.invalidate_metadata_cache("datasets", "dataset")
 
         if self._response_valid(response):
             return Image(json.loads(response.content))
 
+    def upload_images(self,
+                      dataset_id: str,
+                      image_paths: Iterable[Union[str, Path]],
+                      max_workers: int = 4
+                      ) -> Dict[str, Union[Image, DatagymException, OSError, None]]:
+        """ Uploads multiple Images to a Dataset
+
+        The Images are uploaded concurrently. A failed upload does not stop
+        the others, its exception is returned instead of the Image.
+
+        :param str dataset_id: The dataset the images should be uploaded to
+        :param image_paths: The paths to the images that should be uploaded
+        :param int max_workers: The number of concurrent uploads
+        :returns: Dictionary with { image_path : Image, None (non-fatal exception) or the raised exception, ...}
+        :rtype: Dict[str, Union[Image, DatagymException, OSError, None]]
+
+        """
+        def upload(image_path):
+            try:
+                return str(image_path), self.upload_image(dataset_id, str(image_path))
+            except (DatagymException, requests.exceptions.RequestException, OSError) as e:
+                return str(image_path), e
+
+        return dict(self._map(upload, image_paths, max_workers))
+
+    def upload_images_from_directory(self,
+                                     dataset_id: str,
+                                     directory: Union[str, Path],
+                                     pattern: str = "*",
+                                     recursive: bool = False,
+                                     max_workers: int = 4
+                                     ) -> Dict[str, Union[Image, DatagymException, OSError, None]]:
+        """ Uploads all Images of a directory to a Dataset
+
+        :param str dataset_id: The dataset the images should be uploaded to
+        :param directory: The directory containing the images
+        :param str pattern: Glob pattern the image file names have to match, ex. "*.jpg"
+        :param bool recursive: If True images in subdirectories are uploaded as well
+        :param int max_workers: The number of concurrent uploads
+        :returns: Dictionary with { image_path : Image, None (non-fatal exception) or the raised exception, ...}
+        :rtype: Dict[str, Union[Image, DatagymException, OSError, None]]
+
+        """
+        directory = Path(directory)
+        paths = directory.rglob(pattern) if recursive else directory.glob(pattern)
+
+        return self.upload_images(dataset_id,
+                                  (path for path in paths if path.is_file()),
+                                  max_workers=max_workers)
+
     def upload_label_config(self, config_id: str, label_config: List[Dict]) -> bytes or None:
         """ Clears the existing config and replaces it by a new one.
         Careful with this as clearing the config also clears all associated labels
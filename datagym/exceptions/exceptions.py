@@ -6,11 +6,12 @@ on the client side. Both of these classes extend
 :class:`.DatagymException`.
 
 """
-from typing import List
+from typing import List, Optional
 import json
 import re
 import logging
 from pkg_resources import resource_string, ResolutionError
+from datagym.constants import WARNING_KEYS
 
 
 class ExceptionMessageBuilder:
@@ -182,3 +183,33 @@ class InvalidTokenException(ClientException):
         :param args:
         """
         super().__init__(**args)
+
+
+def validate_response(msg_builder: ExceptionMessageBuilder,
+                      logger: logging.Logger,
+                      status_code: int,
+                      content: bytes) -> Optional[bool]:
+    """ Map a DataGym API response to the DataGym exceptions
+
+    Shared by the Client and the AsyncClient, so both raise the same
+    exceptions for the same response.
+
+    :param ExceptionMessageBuilder msg_builder: Error message converter
+    :param logging.Logger logger: Logger for non-fatal exceptions
+    :param int status_code: HTTP status code
+    :param bytes content: The response body
+    :returns: True if the response was successful, False for non-fatal exceptions,
+        None for error responses without content
+    :rtype: bool or None
+    """
+    if status_code < 400:
+        return True
+    elif status_code == 500:
+        if content:
+            raise APIException(msg_builder, **json.loads(content))
+    elif json.loads(content)["key"] in WARNING_KEYS:
+        ClientExceptionNonFatal(msg_builder, logger, **json.loads(content))
+        return False
+    elif content:
+        raise ClientException(msg_builder, **json.loads(content))
+    return None
@@ -0,0 +1,346 @@
+from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, Tuple, List, Iterable, Iterator, Callable, Optional
+import numpy as np
+from ..utils.concurrency import bounded_map, chunked
+
+PARSE_CHUNK_SIZE = 32
+
+
+class GeometryBuffer:
+    """
+    The GeometryBuffer stores the geometries of one label group in flat arrays instead of
+    one dict per point. The datagym label entries are only built in to_label_entries.
+    """
+
+    POLYGON = 0
+    RECTANGLE = 1
+    INTEGER = 2
+    RAW = 4
+
+    __slots__ = ('coordinates', 'offsets', 'kinds', 'classifications', 'raw')
+
+    def __init__(self) -> None:
+        self.coordinates = array('d')
+        self.offsets = array('Q', [0])
+        self.kinds = array('B')
+        self.classifications = []
+        self.raw = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __repr__(self):
+        return f'<GeometryBuffer with {len(self)} geometries>'
+
+    def add(self, kind: int, values, classifications: Dict) -> bool:
+        """
+        Append one polygon or rectangle
+        :param int kind: GeometryBuffer.POLYGON or GeometryBuffer.RECTANGLE
+        :param values: Flat coordinates (x0, y0, x1, y1, ...) or (x, y, w, h) as sequence or numpy array
+        :param Dict classifications: The classifications of the geometry
+        :return: False if the values mix ints and floats and were not stored
+        """
+        if isinstance(values, np.ndarray):
+            if np.issubdtype(values.dtype, np.integer):
+                kind |= self.INTEGER
+            self.coordinates.frombytes(values.astype(np.float64).tobytes())
+        else:
+            value_types = set(map(type, values))
+            if value_types <= {int}:
+                kind |= self.INTEGER
+            elif not value_types <= {float}:
+                return False
+            self.coordinates.extend(values)
+
+        self.offsets.append(len(self.coordinates))
+        self.kinds.append(kind)
+        self.classifications.append(classifications)
+        return True
+
+    def extend(self, kind: int, values: np.ndarray, integer: np.ndarray, classifications: List[Dict]) -> None:
+        """
+        Append many geometries of the same size at once
+        :param int kind: GeometryBuffer.POLYGON or GeometryBuffer.RECTANGLE
+        :param np.ndarray values: The coordinates with one row per geometry
+        :param np.ndarray integer: Boolean mask of the rows whose coordinates are ints
+        :param List[Dict] classifications: The classifications of every geometry
+        :return: None
+        """
+        rows, size = values.shape
+        base = self.offsets[-1]
+        self.coordinates.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        self.offsets.frombytes((base + size * np.arange(1, rows + 1, dtype=np.uint64)).tobytes())
+        self.kinds.frombytes((kind | self.INTEGER * integer).astype(np.uint8).tobytes())
+        self.classifications.extend(classifications)
+
+    def add_raw(self, label_entry: Dict) -> None:
+        """
+        Append a label entry that is kept as it is
+        :param Dict label_entry: The datagym label entry
+        :return: None
+        """
+        self.raw[len(self.kinds)] = label_entry
+        self.offsets.append(len(self.coordinates))
+        self.kinds.append(self.RAW)
+        self.classifications.append(None)
+
+    def to_label_entries(self) -> List[Dict]:
+        """
+        Build the datagym label entries of all stored geometries
+        :return: List of label entries with geometry and classifications
+        """
+        label_entries = []
+        coordinates = self.coordinates.tolist()
+        offsets = self.offsets.tolist()
+        for i, kind in enumerate(self.kinds):
+            if kind == self.RAW:
+                label_entries.append(self.raw[i])
+                continue
+
+            values = coordinates[offsets[i]:offsets[i + 1]]
+            if kind & self.INTEGER:
+                values = list(map(int, values))
+
+            if kind & self.RECTANGLE:
+                x, y, w, h = values
+                geometry = [{"x": x, "y": y, "w": w, "h": h}]
+            else:
+                it = iter(values)
+                geometry = [{"x": x, "y": y} for x, y in zip(it, it)]
+
+            label_entries.append({
+                "geometry": geometry,
+                "classifications": self.classifications[i]
+            })
+        return label_entries
+
+
+class LabelImage:
+    """
+    The LabelImage class collects the labels of one image for the conversion into datagym format.
+    """
+
+    def __init__(self, file_name: str, width: int, height: int) -> None:
+        """
+        :param str file_name: The filename of the image within the filesystem
+        :param int width: The image width
+        :param int height: The image height
+        """
+        self.file_name = file_name
+        self.width = width
+        self.height = height
+        self.geometries: Dict[str, GeometryBuffer] = {}
+        self.classifications = {}
+
+    def __repr__(self):
+        return f'<Image {self.__dict__}>'
+
+    def get_shape(self) -> Tuple:
+        """
+        Gets the shape of the image as a tuple (w, h)
+        :return: (w, h)
+        """
+        shape = (self.width, self.height)
+        return shape
+
+    @property
+    def annotations(self) -> Dict[str, List[Dict]]:
+        """
+        The annotations as datagym label entries, built from the stored geometries
+        :return: Dictionary with { annotation_supercategory : [label_entry, ...], ...}
+        """
+        return {supercategory: geometries.to_label_entries() for supercategory, geometries in self.geometries.items()}
+
+    def __get_geometries(self, annotation_supercategory: str) -> GeometryBuffer:
+        if annotation_supercategory not in self.geometries:
+            self.geometries[annotation_supercategory] = GeometryBuffer()
+        return self.geometries[annotation_supercategory]
+
+    def add_polygon(self, points, classifications: Dict, annotation_supercategory: str) -> None:
+        """
+        Add one polygon annotation.
+        :param points: Flat polygon coordinates (x0, y0, x1, y1, ...) as sequence or numpy array
+        :param Dict classifications: The classifications of the annotation
+        :param annotation_supercategory:
+        :return: None
+        """
+        geometries = self.__get_geometries(annotation_supercategory)
+        if not geometries.add(GeometryBuffer.POLYGON, points[:len(points) - len(points) % 2], classifications):
+            it = iter(points)
+            geometries.add_raw({
+                "geometry": [{"x": x, "y": y} for x, y in zip(it, it)],
+                "classifications": classifications
+            })
+
+    def add_rectangle(self, bbox, classifications: Dict, annotation_supercategory: str) -> None:
+        """
+        Add one rectangle annotation.
+        :param bbox: The rectangle as (x, y, w, h)
+        :param Dict classifications: The classifications of the annotation
+        :param annotation_supercategory:
+        :return: None
+        """
+        geometries = self.__get_geometries(annotation_supercategory)
+        if not geometries.add(GeometryBuffer.RECTANGLE, bbox[:4], classifications):
+            geometries.add_raw({
+                "geometry": [{"x": bbox[0], "y": bbox[1], "w": bbox[2], "h": bbox[3]}],
+                "classifications": classifications
+            })
+
+    def add_rectangles(self,
+                       bboxes: np.ndarray,
+                       integer: np.ndarray,
+                       classifications: List[Dict],
+                       annotation_supercategory: str) -> None:
+        """
+        Add many rectangle annotations at once.
+        :param np.ndarray bboxes: The rectangles as array of shape (n, 4) with rows (x, y, w, h)
+        :param np.ndarray integer: Boolean mask of the rectangles whose coordinates are ints
+        :param List[Dict] classifications: The classifications of every annotation
+        :param annotation_supercategory:
+        :return: None
+        """
+        self.__get_geometries(annotation_supercategory).extend(GeometryBuffer.RECTANGLE,
+                                                               bboxes,
+                                                               integer,
+                                                               classifications)
+
+    def add_annotation(self, label_entry: Dict, annotation_supercategory: str) -> None:
+        """
+        Add one annotation from the annotation list in the json to the annotations dictionary.
+        Polygons and rectangles are stored compactly, other label entries as they are.
+        :param label_entry:
+        :param annotation_supercategory:
+        :return: None
+        """
+        geometry = label_entry.get("geometry")
+        if label_entry.keys() == {"geometry", "classifications"} and geometry:
+            if all(point.keys() == {"x", "y"} for point in geometry):
+                points = [value for point in geometry for value in (point["x"], point["y"])]
+                self.add_polygon(points, label_entry["classifications"], annotation_supercategory)
+                return
+            if len(geometry) == 1 and geometry[0].keys() == {"x", "y", "w", "h"}:
+                rectangle = geometry[0]
+                bbox = [rectangle["x"], rectangle["y"], rectangle["w"], rectangle["h"]]
+                self.add_rectangle(bbox, label_entry["classifications"], annotation_supercategory)
+                return
+
+        self.__get_geometries(annotation_supercategory).add_raw(label_entry)
+
+    def datagymify(self, image_ids_dict: Dict) -> Dict:
+        """
+        Convert all labels on an image into a datagym compatible entry for the upload json
+        :param Dict image_ids_dict: Image ids dict with { image_name : media_id, ...}
+        :return: image entry as dict if image in image_ids_dict
+        """
+        if self.file_name in image_ids_dict:
+            internal_media_ID = image_ids_dict[self.file_name]
+            image_entry = {
+                "internal_media_ID": internal_media_ID,
+                "keepData": False,
+                # "image_name": self.file_name,
+                "global_classifications": self.classifications,
+                "labels": self.annotations
+            }
+            return image_entry
+        else:
+            return None
+
+
+class Importer(ABC):
+    """
+    The Importer class is the base of all label importers. An importer yields its
+    images as LabelImage instances, the conversion into datagym format is shared.
+    """
+
+    def __init__(self, label_key: Optional[str] = None) -> None:
+        """
+        :param str label_key: The label key used for all classes with the class name as subcategory.
+            Without label_key every class name is used as label key.
+        """
+        self.label_key = label_key
+        self._labels: Dict[str, Tuple[str, Dict]] = {}
+
+    def _get_label(self, class_name: str) -> Tuple[str, Dict]:
+        """
+        Get the label key and the classifications of a class, shared by all annotations of the class
+        :param str class_name: The class name from the label file
+        :return: (label_key, classifications)
+        """
+        label = self._labels.get(class_name)
+        if label is None:
+            if self.label_key:
+                label = (self.label_key, {"subcategory": [class_name]})
+            else:
+                label = (class_name, {})
+            self._labels[class_name] = label
+        return label
+
+    @abstractmethod
+    def iter_label_images(self) -> Iterator[LabelImage]:
+        """
+        Iterate over all images with labels of this importer
+        :return: Iterator over LabelImage instances
+        """
+
+    def get_datagym_label_dict(self, image_ids_dict: Dict) -> Dict:
+        """
+        Use this method once you have added your json data to return a json upload object in datagym format
+        :param image_ids_dict:  Image ids dict with { image_name : media_id, ...}
+        :return: Datagym json upload object
+        """
+        return list(self.iter_datagym_labels(image_ids_dict))
+
+    def iter_datagym_labels(self, image_ids_dict: Dict) -> Iterator[Dict]:
+        """
+        Like get_datagym_label_dict, but the image entries are built one at a time while iterating.
+        Pass the iterator to Client.import_label_data to convert and upload at the same time.
+        :param image_ids_dict:  Image ids dict with { image_name : media_id, ...}
+        :return: Iterator over the image entries in datagym format
+        """
+        for image in self.iter_label_images():
+            image_entry = image.datagymify(image_ids_dict)
+            if image_entry:
+                yield image_entry
+
+    def iter_datagym_label_batches(self, image_ids_dict: Dict, batch_size: int = 50) -> Iterator[List[Dict]]:
+        """
+        Like iter_datagym_labels, but the image entries are yielded in lists of batch_size entries
+        :param image_ids_dict:  Image ids dict with { image_name : media_id, ...}
+        :param int batch_size: The maximum number of image entries per batch
+        :return: Iterator over the batches of image entries in datagym format
+        """
+        return chunked(self.iter_datagym_labels(image_ids_dict), batch_size)
+
+    @staticmethod
+    def _map_files(parse_file: Callable, file_paths: Iterable, num_workers: int = 1) -> Iterator:
+        """
+        Parse files in input order, with more than one worker on a process pool
+        :param Callable parse_file: A module level function parsing one file
+        :param file_paths: The files to parse
+        :param int num_workers: Number of processes parsing files
+        :return: Iterator over the results of parse_file
+        """
+        if num_workers <= 1:
+            yield from map(parse_file, file_paths)
+            return
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            results = bounded_map(executor,
+                                  _parse_files,
+                                  ((parse_file, chunk) for chunk in chunked(file_paths, PARSE_CHUNK_SIZE)),
+                                  4 * num_workers)
+            yield from chain.from_iterable(results)
+
+
+def _parse_files(task: Tuple[Callable, List]) -> List:
+    """
+    Parse a chunk of files, used by the worker processes
+    :param task: The parse function and the file paths
+    :return: The results of the parse function
+    """
+    parse_file, file_paths = task
+    return [parse_file(file_path) for file_path in file_paths]
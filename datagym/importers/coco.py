@@ -1,9 +1,62 @@
-from typing import Dict, Tuple, List
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import operator
+import sys
+from itertools import chain, tee, repeat
+from pathlib import Path
+from typing import Dict, List, Iterable, Iterator, Callable, Optional, Union
 import cv2
-from ..utils.coco_utils import add_to_dict_valuelist, decodeMask
+import numpy as np
+from ..utils.coco_utils import decodeMask
+from ..utils.concurrency import bounded_map, chunked
+from ..utils.json_stream import JsonStreamReader, iter_json_file_chunks
+from .base import Importer, LabelImage
 
+RLE_CHUNK_SIZE = 64
+BBOX_CHUNK_SIZE = 65536
 
-class CocoImage:
+_FLOAT_BBOX = 0
+_INT_BBOX = 1
+_MIXED_BBOX = 2
+
+
+def rle_to_polygons(annotation_RLE: Dict) -> List[np.ndarray]:
+    """
+    Convert a RLE mask into approximated polygons
+    :param Dict annotation_RLE: The RLE segmentation of a coco annotation
+    :return: One int32 array of shape (n, 2) with the polygon points per contour
+    """
+    mask = decodeMask(annotation_RLE)
+    contours, _ = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+
+    polygons = []
+    for cnt in contours:
+        approx = cv2.approxPolyDP(cnt, 0.009 * cv2.arcLength(cnt, True), True)
+        polygons.append(approx.reshape(-1, 2).astype(np.int32))
+
+    return polygons
+
+
+def _is_rle_annotation(annotation: Dict) -> bool:
+    """
+    Check if a coco annotation is segmented with a RLE mask
+    :param Dict annotation: The coco annotation
+    :return: True for crowd annotations with RLE masks
+    """
+    return annotation["iscrowd"] != 0 and "size" in annotation["segmentation"]
+
+
+def _rles_to_polygons(annotation_RLEs: List[Optional[Dict]]) -> List[Optional[List[np.ndarray]]]:
+    """
+    Convert a chunk of RLE masks into polygons, used by the worker processes
+    :param annotation_RLEs: The RLE segmentations, None for annotations without RLE mask
+    :return: The polygons of every RLE mask
+    """
+    return [rle_to_polygons(annotation_RLE) if annotation_RLE is not None else None
+            for annotation_RLE in annotation_RLEs]
+
+
+class CocoImage(LabelImage):
     """
     The CocoImage class is the collection of all the information that
     is provided in multiple coco format json files.
@@ -18,99 +71,53 @@ class CocoImage:
         :param int height: The image height
         :param str coco_url: The download url if available
         """
-        self.file_name = file_name
+        super().__init__(file_name=file_name, width=width, height=height)
         self.coco_image_id = coco_image_id
-        self.width = width
-        self.height = height
         if coco_url:
             self.coco_url = coco_url
-        self.annotations = {}
-        self.classifications = {}
 
-    def __repr__(self):
-        return f'<Image {self.__dict__}>'
 
-    def get_shape(self) -> Tuple:
-        """
-        Gets the shape of the image as a tuple (w, h)
-        :return: (w, h)
-        """
-        shape = (self.width, self.height)
-        return shape
-
-    def add_annotation(self, label_entry: List, annotation_supercategory: str) -> None:
-        """
-        Add one annotation from the annotation list in the json to the annotations dictionary.
-        :param label_entry:
-        :param annotation_supercategory:
-        :return: None
-        """
-        self.annotations = add_to_dict_valuelist(
-            dictionary=self.annotations,
-            key=annotation_supercategory,
-            value=label_entry
-        )
-
-    def datagymify(self, image_ids_dict: Dict) -> Dict:
-        """
-        Convert all labels on an image into a datagym compatible entry for the upload json
-        :param Dict image_ids_dict: Image ids dict with { image_name : coco_img_id, ...}
-        :return: image entry as dict if image in image_ids_dict
-        """
-        if self.file_name in image_ids_dict:
-            internal_media_ID = image_ids_dict[self.file_name]
-            image_entry = {
-                "internal_media_ID": internal_media_ID,
-                "keepData": False,
-                # "image_name": self.file_name,
-                "global_classifications": self.classifications,
-                "labels": self.annotations
-            }
-            return image_entry
-        else:
-            return None
-
-
-class Coco:
+class Coco(Importer):
     """
     The coco class is used to convert coco format labels into datagym format
     """
 
     def __init__(self) -> None:
+        super().__init__()
         self.instances_supercategories = {}
         self.category_dict = {}
         self.coco_images = {}
 
-    def get_datagym_label_dict(self, image_ids_dict: Dict) -> Dict:
+        # Lookup tables of the categories, rebuilt whenever categories are added
+        self._category_index = {}
+        self._category_lookup = None
+        self._category_supercategory = np.zeros(0, dtype=np.int64)
+        self._category_classifications = []
+        self._supercategories = []
+
+    def iter_label_images(self) -> Iterator[CocoImage]:
         """
-        Use this method once you have added your json data to return a json upload object in datagym format
-        :param image_ids_dict:  Image ids dict with { image_name : coco_img_id, ...}
-        :return: Datagym json upload object
+        Iterate over the images of all added coco json files
+        :return: Iterator over the CocoImage instances
         """
+        return iter(self.coco_images.values())
 
-        upload_json = []
-
-        for image in self.coco_images.values():
-            image_entry = image.datagymify(image_ids_dict)
-            if image_entry:
-                upload_json.append(image_entry)
-
-        return upload_json
-
-    def add_object_detection_data(self, json_data: Dict, polygon: bool = False) -> None:
+    def add_object_detection_data(self, json_data: Dict, polygon: bool = False, num_workers: int = 1) -> None:
         """
         Use this method to add the instances json contents to your coco instance for later conversion
         :param Dict json_data: Json data loaded from your instances json file
         :param polygon: Boolean to decide whether to use the bbox (false) or the polygon (true)
+        :param int num_workers: Number of processes converting RLE (crowd) masks to polygons.
+            With more than one worker, call this from within an ``if __name__ == "__main__":`` block.
         :return: None
         """
-        self.__get_coco_object_categories(json_data)
-        self.__get_coco_images(json_data)
+        self.__get_coco_object_categories(json_data["categories"])
+        self.__get_coco_images(json_data["images"])
 
         if polygon:
-            self.__process_coco_polygons(json_data)
+            self.__process_coco_polygons(json_data["annotations"], num_workers)
         else:
-            self.__process_coco_bbox(json_data)
+            self.__process_coco_bbox(json_data["annotations"])
 
     def add_captions_data(self, json_data: Dict) -> None:
         """
@@ -118,88 +125,223 @@ class Coco:
         :param Dict json_data: Json data loaded from your instances json file
         :return: None
         """
-        self.__get_coco_images(json_data)
-        self.__process_coco_caption(json_data)
+        self.__get_coco_images(json_data["images"])
+        self.__process_coco_caption(json_data["annotations"])
 
-    def __process_coco_polygons(self, instances_data: Dict) -> None:
+    def add_object_detection_file(self,
+                                  file_path: Union[str, Path],
+                                  polygon: bool = False,
+                                  num_workers: int = 1) -> None:
         """
-        Based on the instances json add the coco polygon instances to the respective CocoImage instance
-        :param instances_data: Json data loaded from your instances json file
+        Use this method to add an instances json file to your coco instance for later conversion.
+        The file is parsed incrementally and the annotations are converted while they are read,
+        so the json file is never loaded as a whole.
+        :param file_path: Path to your instances json file
+        :param polygon: Boolean to decide whether to use the bbox (false) or the polygon (true)
+        :param int num_workers: Number of processes converting RLE (crowd) masks to polygons.
+            With more than one worker, call this from within an ``if __name__ == "__main__":`` block.
         :return: None
         """
-        for annotation in instances_data["annotations"]:
-            annotation_supercategory = self.category_dict[annotation["category_id"]]["supercategory"]
-            annotation_name = self.category_dict[annotation["category_id"]]["name"]
-
-            if annotation["iscrowd"] == 0:
-                polygon = []
-                it = iter(annotation["segmentation"][0])
-                for x, y in zip(it, it):
-                    polygon.append({"x": x, "y": y})
-
-                label_entry = {
-                    "geometry": polygon,
-                    "classifications": {"subcategory": [annotation_name]}
-                }
-
-                self.coco_images[annotation["image_id"]].add_annotation(label_entry, annotation_supercategory)
-
-            elif "size" in annotation["segmentation"]:
-                annotation_RLE = annotation["segmentation"]
-                mask = decodeMask(annotation_RLE)
-                contours, _ = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-
-                for cnt in contours:
-                    approx = cv2.approxPolyDP(cnt, 0.009 * cv2.arcLength(cnt, True), True)
-
-                    polygon = [{"x": int(point[0][0]), "y": int(point[0][1])} for point in approx]
-
-                    label_entry = {
-                        "geometry": polygon,
-                        "classifications": {"subcategory": [annotation_name]}
-                    }
-
-                    self.coco_images[annotation["image_id"]].add_annotation(label_entry, annotation_supercategory)
+        if polygon:
+            self.__add_coco_file(file_path, lambda annotations: self.__process_coco_polygons(annotations, num_workers))
+        else:
+            self.__add_coco_file(file_path, self.__process_coco_bbox)
 
-    def __process_coco_bbox(self, instances_data: Dict) -> None:
+    def add_captions_file(self, file_path: Union[str, Path]) -> None:
         """
-        Based on the instances json add the coco bbox instances to the respective CocoImage instance
-        :param instances_data: Json data loaded from your instances json file
+        Use this method to add a captions json file to your coco instance for later conversion.
+        The file is parsed incrementally like in add_object_detection_file.
+        :param file_path: Path to your captions json file
         :return: None
         """
-        for annotation in instances_data["annotations"]:
-            annotation_supercategory = self.category_dict[annotation["category_id"]]["supercategory"]
-            annotation_name = self.category_dict[annotation["category_id"]]["name"]
-            rectangle = {
-                "x": annotation["bbox"][0],
-                "y": annotation["bbox"][1],
-                "w": annotation["bbox"][2],
-                "h": annotation["bbox"][3]
-            }
-            label_entry = {
-                "geometry": [rectangle],
-                "classifications": {"subcategory": [annotation_name]}
-            }
+        self.__add_coco_file(file_path, self.__process_coco_caption, with_categories=False)
 
-            self.coco_images[annotation["image_id"]].add_annotation(label_entry, annotation_supercategory)
-
-    def __process_coco_caption(self, captions_data: Dict) -> None:
+    def __add_coco_file(self,
+                        file_path: Union[str, Path],
+                        process_annotations: Callable[[Iterable[Dict]], None],
+                        with_categories: bool = True) -> None:
+        """
+        Stream the images, categories and annotations of a coco json file into this coco instance
+        :param file_path: Path to your coco json file
+        :param process_annotations: Converts the streamed annotations
+        :param bool with_categories: If the annotations need the categories
+        :return: None
+        """
+        seen = set()
+        required = {"images", "categories"} if with_categories else {"images"}
+        annotations_skipped = False
+
+        with open(file_path, 'rb') as coco_file:
+            for key, value in JsonStreamReader(iter_json_file_chunks(coco_file)).iter_object():
+                if key == "images":
+                    self.__get_coco_images(value)
+                elif key == "categories" and with_categories:
+                    self.__get_coco_object_categories(value)
+                elif key == "annotations":
+                    if required <= seen:
+                        process_annotations(value)
+                    else:
+                        # The annotations come before the data they reference, read them in a second pass
+                        annotations_skipped = True
+                seen.add(key)
+
+        if annotations_skipped:
+            with open(file_path, 'rb') as coco_file:
+                for key, value in JsonStreamReader(iter_json_file_chunks(coco_file)).iter_object():
+                    if key == "annotations":
+                        process_annotations(value)
+                        break
+
+    def __process_coco_polygons(self, annotations: Iterable[Dict], num_workers: int = 1) -> None:
+        """
+        Based on the instances json add the coco polygon instances to the respective CocoImage instance
+        :param annotations: The annotations from your instances json file
+        :param int num_workers: Number of processes converting RLE masks to polygons
+        :return: None
+        """
+        if num_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=num_workers)
+            # The annotations are read only once, the chunks are kept until their polygons arrive
+            chunks, pending_chunks = tee(chunked(annotations, RLE_CHUNK_SIZE))
+            chunk_RLEs = ([annotation["segmentation"] if _is_rle_annotation(annotation) else None
+                           for annotation in chunk] for chunk in chunks)
+            # The chunks are converted in parallel but yielded in annotation order
+            chunk_polygons = bounded_map(executor, _rles_to_polygons, chunk_RLEs, 4 * num_workers)
+            annotation_polygons = chain.from_iterable(zip(chunk, polygons)
+                                                      for chunk, polygons in zip(pending_chunks, chunk_polygons))
+        else:
+            executor = None
+            annotation_polygons = ((annotation,
+                                    rle_to_polygons(annotation["segmentation"])
+                                    if _is_rle_annotation(annotation) else None)
+                                   for annotation in annotations)
+
+        try:
+            for annotation, rle_polygons in annotation_polygons:
+                category = self._category_index[annotation["category_id"]]
+                annotation_supercategory = self._supercategories[self._category_supercategory[category]]
+                classifications = self._category_classifications[category]
+
+                if annotation["iscrowd"] == 0:
+                    self.coco_images[annotation["image_id"]].add_polygon(annotation["segmentation"][0],
+                                                                         classifications,
+                                                                         annotation_supercategory)
+
+                elif rle_polygons is not None:
+                    for points in rle_polygons:
+                        self.coco_images[annotation["image_id"]].add_polygon(points.ravel(),
+                                                                             classifications,
+                                                                             annotation_supercategory)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def __process_coco_bbox(self, annotations: Iterable[Dict]) -> None:
+        """
+        Based on the instances json add the coco bbox instances to the respective CocoImage instance.
+        The annotations are collected in columns, grouped by image and supercategory with a stable
+        sort and added to the CocoImage instances group by group.
+        :param annotations: The annotations from your instances json file
+        :return: None
+        """
+        image_index = {image_id: i for i, image_id in enumerate(self.coco_images)}
+
+        image_column = array('q')
+        category_column = array('q')
+        type_column = array('B')
+        bbox_column = array('d')
+        mixed_bboxes = {}
+
+        for chunk in chunked(annotations, BBOX_CHUNK_SIZE):
+            chunk_bboxes = [annotation["bbox"] for annotation in chunk]
+            # Every bbox is checked, a long and a short bbox must not shift the values of the next one
+            if any(len(bbox) != 4 for bbox in chunk_bboxes):
+                if any(len(bbox) < 4 for bbox in chunk_bboxes):
+                    raise IndexError("Every coco bbox needs 4 values (x, y, w, h)")
+                # Only the first 4 values of longer bboxes are used
+                chunk_bboxes = [bbox[:4] for bbox in chunk_bboxes]
+            values = list(chain.from_iterable(chunk_bboxes))
+
+            # Remember if the values were ints or floats to write them back unchanged
+            value_types = list(map(type, values))
+            is_float = np.fromiter(map(operator.is_, value_types, repeat(float)), bool, len(values))
+            is_int = np.fromiter(map(operator.is_, value_types, repeat(int)), bool, len(values))
+            row_types = np.full(len(chunk), _MIXED_BBOX, dtype=np.uint8)
+            row_types[is_float.reshape(-1, 4).all(axis=1)] = _FLOAT_BBOX
+            row_types[is_int.reshape(-1, 4).all(axis=1)] = _INT_BBOX
+
+            for row in np.flatnonzero(row_types == _MIXED_BBOX).tolist():
+                mixed_bboxes[len(image_column) + row] = chunk_bboxes[row]
+                values[4 * row:4 * row + 4] = [0, 0, 0, 0]
+
+            image_column.extend([image_index[annotation["image_id"]] for annotation in chunk])
+            category_indices = self.__get_category_indices([annotation["category_id"] for annotation in chunk])
+            category_column.frombytes(category_indices.tobytes())
+            type_column.frombytes(row_types.tobytes())
+            bbox_column.extend(values)
+
+        if not image_column:
+            return
+
+        images = np.frombuffer(image_column, dtype=np.int64)
+        categories = np.frombuffer(category_column, dtype=np.int64)
+        types = np.frombuffer(type_column, dtype=np.uint8)
+        bboxes = np.frombuffer(bbox_column, dtype=np.float64).reshape(-1, 4)
+        supercategory_column = self._category_supercategory[categories]
+
+        # Stable sort, so the annotations keep their order within each group
+        order = np.lexsort((supercategory_column, images))
+        sorted_images = images[order]
+        sorted_supercategories = supercategory_column[order]
+        changes = np.flatnonzero((np.diff(sorted_images) != 0) | (np.diff(sorted_supercategories) != 0)) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [len(order)]))
+        # Within an image the supercategories are added in the order of their first annotation
+        group_order = np.lexsort((order[starts], sorted_images[starts]))
+
+        coco_images = list(self.coco_images.values())
+
+        for group in group_order.tolist():
+            rows = order[starts[group]:ends[group]]
+            coco_image = coco_images[sorted_images[starts[group]]]
+            annotation_supercategory = self._supercategories[sorted_supercategories[starts[group]]]
+            classifications = list(map(self._category_classifications.__getitem__, categories[rows].tolist()))
+
+            if not (types[rows] == _MIXED_BBOX).any():
+                coco_image.add_rectangles(bboxes[rows], types[rows] == _INT_BBOX,
+                                          classifications, annotation_supercategory)
+                continue
+
+            # Add the runs between mixed bboxes in bulk, the mixed bboxes one by one
+            mixed_positions = np.flatnonzero(types[rows] == _MIXED_BBOX).tolist()
+            run_start = 0
+            for position in mixed_positions + [len(rows)]:
+                if position > run_start:
+                    run = rows[run_start:position]
+                    coco_image.add_rectangles(bboxes[run], types[run] == _INT_BBOX,
+                                              classifications[run_start:position], annotation_supercategory)
+                if position < len(rows):
+                    coco_image.add_rectangle(mixed_bboxes[int(rows[position])], classifications[position],
+                                             annotation_supercategory)
+                run_start = position + 1
+
+    def __process_coco_caption(self, annotations: Iterable[Dict]) -> None:
         """
         Based on the captions json add the image caption to the respective CocoImage instance
-        :param captions_data: Json data loaded from your instances json file
+        :param annotations: The annotations from your captions json file
         :return: None
         """
-        for annotation in captions_data["annotations"]:
+        for annotation in annotations:
 
             self.coco_images[annotation["image_id"]].classifications["caption"] = [annotation["caption"]]
 
-    def __get_coco_images(self, images_data: Dict) -> None:
+    def __get_coco_images(self, images: Iterable[Dict]) -> None:
         """
         Fill the coco_images dict based on all the images inside your coco json file
-        :param images_data: Json data loaded from your coco json file
+        :param images: The images from your coco json file
         :return: None
         """
-        for image in images_data["images"]:
+        for image in images:
             if "coco_url" in image.keys():
                 value = CocoImage(
                         file_name=image["file_name"],
@@ -219,21 +361,60 @@ class Coco:
             if image["id"] not in self.coco_images:
                 self.coco_images[image["id"]] = value
 
-    def __get_coco_object_categories(self, instances_data: Dict) -> None:
+    def __get_coco_object_categories(self, categories: Iterable[Dict]) -> None:
         """
         Fill the coco category dict based on all the categories inside your coco json file
-        :param instances_data: Json data loaded from your coco json file
+        :param categories: The categories from your coco json file
         :return: None
         """
-        for category in instances_data["categories"]:
+        for category in categories:
+            # Interned, so all annotations reference the same string objects
+            name = sys.intern(category["name"])
+            supercategory = sys.intern(category["supercategory"])
+
+            self.instances_supercategories.setdefault(supercategory, []).append(name)
 
-            key = category["supercategory"]
-            value = category["name"]
+            self.category_dict[category["id"]] = dict(name=name, supercategory=supercategory)
 
-            self.instances_supercategories = add_to_dict_valuelist(
-                dictionary=self.instances_supercategories,
-                key=key,
-                value=value
-            )
+        self.__build_category_tables()
 
-            self.category_dict[category["id"]] = dict(name=category["name"], supercategory=category["supercategory"])
+    def __build_category_tables(self) -> None:
+        """
+        Build the lookup tables from category ids to the category index, and from the category
+        index to its supercategory and its classifications. All annotations of a category share
+        the same classifications object.
+        :return: None
+        """
+        category_ids = list(self.category_dict)
+        categories = list(self.category_dict.values())
+
+        self._category_index = {category_id: i for i, category_id in enumerate(category_ids)}
+        self._supercategories = list(dict.fromkeys(category["supercategory"] for category in categories))
+        supercategory_index = {supercategory: i for i, supercategory in enumerate(self._supercategories)}
+        self._category_supercategory = np.array([supercategory_index[category["supercategory"]]
+                                                 for category in categories], dtype=np.int64)
+        self._category_classifications = [{"subcategory": [category["name"]]} for category in categories]
+
+        # Dense table for the usual small int ids, looked up in one vectorized step
+        if category_ids and all(type(category_id) is int and category_id >= 0 for category_id in category_ids):
+            self._category_lookup = np.full(max(category_ids) + 1, -1, dtype=np.int64)
+            self._category_lookup[category_ids] = np.arange(len(category_ids))
+        else:
+            self._category_lookup = None
+
+    def __get_category_indices(self, category_ids: List) -> np.ndarray:
+        """
+        Look up the category index of many category ids
+        :param category_ids: The category ids of the annotations
+        :return: The category indices
+        """
+        if self._category_lookup is None:
+            return np.array([self._category_index[category_id] for category_id in category_ids], dtype=np.int64)
+
+        ids = np.array(category_ids, dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self._category_lookup))
+        indices = np.full(len(ids), -1, dtype=np.int64)
+        indices[known] = self._category_lookup[ids[known]]
+        if (indices < 0).any():
+            raise KeyError(category_ids[int(np.flatnonzero(indices < 0)[0])])
+        return indices
@@ -0,0 +1,83 @@
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+from typing import Tuple, List, Iterator, Union
+from .base import Importer, LabelImage
+
+
+def _parse_number(text: str) -> Union[int, float]:
+    """
+    Parse a coordinate of a voc file, keeping ints as ints
+    :param str text: The element text
+    :return: The number
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_voc_file(annotation_path: Path) -> Tuple[str, int, int, List[Tuple[str, List]]]:
+    """
+    Parse one pascal voc xml file, used by the worker processes
+    :param Path annotation_path: The voc xml file
+    :return: (file_name, width, height, objects) with the objects as (class_name, [x, y, w, h])
+    """
+    root = ElementTree.parse(annotation_path).getroot()
+    file_name = root.findtext("filename")
+    width = int(root.findtext("size/width"))
+    height = int(root.findtext("size/height"))
+
+    objects = []
+    for voc_object in root.iter("object"):
+        bndbox = voc_object.find("bndbox")
+        if bndbox is None:
+            continue
+        xmin, ymin, xmax, ymax = (_parse_number(bndbox.findtext(tag)) for tag in ("xmin", "ymin", "xmax", "ymax"))
+        objects.append((voc_object.findtext("name"), [xmin, ymin, xmax - xmin, ymax - ymin]))
+
+    return file_name, width, height, objects
+
+
+class PascalVoc(Importer):
+    """
+    The PascalVoc class is used to convert pascal voc xml labels into datagym format.
+    The xml files are read lazily while the datagym label entries are created.
+    """
+
+    def __init__(self,
+                 annotations_dir: Union[str, Path],
+                 label_key: str = None,
+                 recursive: bool = False,
+                 num_workers: int = 1) -> None:
+        """
+        :param annotations_dir: The directory with one voc xml file per image
+        :param str label_key: The label key used for all classes with the class name as subcategory.
+            Without label_key every class name is used as label key.
+        :param bool recursive: Search xml files in subdirectories
+        :param int num_workers: Number of processes parsing xml files.
+            With more than one worker, iterate from within an ``if __name__ == "__main__":`` block.
+        """
+        super().__init__(label_key=label_key)
+        self.annotations_dir = Path(annotations_dir)
+        self.recursive = recursive
+        self.num_workers = num_workers
+
+    def iter_annotation_files(self) -> Iterator[Path]:
+        """
+        Walk the annotations directory lazily
+        :return: Iterator over the voc xml files
+        """
+        return self.annotations_dir.rglob("*.xml") if self.recursive else self.annotations_dir.glob("*.xml")
+
+    def iter_label_images(self) -> Iterator[LabelImage]:
+        """
+        Parse the xml files and yield one LabelImage per file
+        :return: Iterator over the LabelImage instances
+        """
+        for file_name, width, height, objects in \
+                self._map_files(_parse_voc_file, self.iter_annotation_files(), self.num_workers):
+            label_image = LabelImage(file_name=file_name, width=width, height=height)
+            for class_name, bbox in objects:
+                annotation_key, classifications = self._get_label(class_name)
+                label_image.add_rectangle(bbox, classifications, annotation_key)
+            yield label_image
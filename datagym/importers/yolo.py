@@ -0,0 +1,143 @@
+from functools import partial
+from pathlib import Path
+from typing import Dict, Tuple, List, Iterator, Optional, Union
+import cv2
+import numpy as np
+from .base import Importer, LabelImage
+from ..utils.image_size import read_image_size
+
+
+def _parse_yolo_file(label_path: Path,
+                     labels_dir: Path,
+                     images_dir: Optional[Path],
+                     image_size: Optional[Tuple[int, int]],
+                     image_extension: str) -> Tuple:
+    """
+    Parse one yolo label file, used by the worker processes
+    :param Path label_path: The yolo txt file
+    :param Path labels_dir: The root directory of the label files
+    :param Path images_dir: The root directory of the images, used to read the image size
+    :param image_size: The size (w, h) of all images
+    :param str image_extension: The file extension of the images
+    :return: (file_name, width, height, class_ids, rectangles, polygons) with the rectangles
+        as float array of shape (n, 4) in pixels and the polygons as (class_id, flat pixel coordinates)
+    """
+    file_name = label_path.stem + image_extension
+    if image_size is not None:
+        width, height = image_size
+    elif images_dir is not None:
+        image_path = images_dir / label_path.relative_to(labels_dir).with_name(file_name)
+        size = read_image_size(image_path)
+        if size is None:
+            # Other formats are fully decoded, which is much slower than reading the header
+            image = cv2.imread(str(image_path))
+            if image is None:
+                raise ValueError(f'Could not read the image size of "{image_path}"')
+            size = image.shape[1::-1]
+        width, height = size
+    else:
+        raise ValueError("Either images_dir or image_size is required to convert yolo labels")
+
+    class_ids = []
+    rectangles = []
+    polygons = []
+    with open(label_path) as label_file:
+        for line in label_file:
+            values = line.split()
+            if not values:
+                continue
+            if len(values) == 5:
+                class_ids.append(int(values[0]))
+                rectangles.append(list(map(float, values[1:])))
+            elif len(values) > 5 and len(values) % 2 == 1:
+                points = np.array(values[1:], dtype=np.float64).reshape(-1, 2) * (width, height)
+                polygons.append((int(values[0]), points.ravel()))
+            else:
+                raise ValueError(f'Invalid yolo label line "{line.strip()}" in "{label_path}"')
+
+    # (cx, cy, w, h) normalized to (x, y, w, h) in pixels
+    boxes = np.array(rectangles, dtype=np.float64).reshape(-1, 4) * (width, height, width, height)
+    boxes[:, :2] -= boxes[:, 2:] / 2
+
+    return file_name, width, height, np.array(class_ids, dtype=np.int64), boxes, polygons
+
+
+class Yolo(Importer):
+    """
+    The Yolo class is used to convert yolo txt labels into datagym format.
+    The label files are read lazily while the datagym label entries are created.
+    """
+
+    def __init__(self,
+                 labels_dir: Union[str, Path],
+                 class_names: List[str],
+                 images_dir: Union[str, Path] = None,
+                 image_size: Tuple[int, int] = None,
+                 image_extension: str = ".jpg",
+                 label_key: str = None,
+                 recursive: bool = False,
+                 num_workers: int = 1) -> None:
+        """
+        :param labels_dir: The directory with one yolo txt file per image
+        :param List[str] class_names: The class names in the order of the yolo class ids
+        :param images_dir: The directory with the images, used to read the image sizes.
+            The sizes of JPEG, PNG, GIF and BMP images are read from the file header,
+            other formats are fully decoded with OpenCV, which dominates the conversion time.
+        :param image_size: The size (w, h) of all images, the fastest option as no image is read
+        :param str image_extension: The file extension of the images with leading dot
+        :param str label_key: The label key used for all classes with the class name as subcategory.
+            Without label_key every class name is used as label key.
+        :param bool recursive: Search label files in subdirectories
+        :param int num_workers: Number of processes parsing label files.
+            With more than one worker, iterate from within an ``if __name__ == "__main__":`` block.
+        """
+        super().__init__(label_key=label_key)
+        self.labels_dir = Path(labels_dir)
+        self.class_names = list(class_names)
+        self.images_dir = Path(images_dir) if images_dir is not None else None
+        self.image_size = tuple(image_size) if image_size is not None else None
+        self.image_extension = image_extension
+        self.recursive = recursive
+        self.num_workers = num_workers
+
+    def iter_label_files(self) -> Iterator[Path]:
+        """
+        Walk the labels directory lazily
+        :return: Iterator over the yolo txt files
+        """
+        label_files = self.labels_dir.rglob("*.txt") if self.recursive else self.labels_dir.glob("*.txt")
+        return (label_file for label_file in label_files if label_file.name != "classes.txt")
+
+    def iter_label_images(self) -> Iterator[LabelImage]:
+        """
+        Parse the label files and yield one LabelImage per file
+        :return: Iterator over the LabelImage instances
+        """
+        parse_file = partial(_parse_yolo_file,
+                             labels_dir=self.labels_dir,
+                             images_dir=self.images_dir,
+                             image_size=self.image_size,
+                             image_extension=self.image_extension)
+
+        for file_name, width, height, class_ids, boxes, polygons in \
+                self._map_files(parse_file, self.iter_label_files(), self.num_workers):
+            label_image = LabelImage(file_name=file_name, width=width, height=height)
+
+            labels = list(map(self.__get_label, class_ids.tolist()))
+            for annotation_key in dict.fromkeys(key for key, _ in labels):
+                rows = [i for i, (key, _) in enumerate(labels) if key == annotation_key]
+                label_image.add_rectangles(boxes[rows],
+                                           np.zeros(len(rows), dtype=bool),
+                                           [labels[i][1] for i in rows],
+                                           annotation_key)
+
+            for class_id, points in polygons:
+                annotation_key, classifications = self.__get_label(class_id)
+                label_image.add_polygon(points, classifications, annotation_key)
+
+            yield label_image
+
+    def __get_label(self, class_id: int) -> Tuple[str, Dict]:
+        if not 0 <= class_id < len(self.class_names):
+            raise KeyError(f"Unknown yolo class id {class_id}")
+        return self._get_label(self.class_names[class_id])
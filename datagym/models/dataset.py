@@ -1,8 +1,57 @@
 from datagym.models.image import Image
 from datagym.models.video import Video
-from typing import List, Dict
+from functools import lru_cache, wraps
+from typing import List, Dict, Iterator, Optional, Union
 import re
 
+MEDIA_MODELS = {"IMAGE": Image, "VIDEO": Video}
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str):
+    """ Compile a media name search pattern once
+
+    :param str pattern: The regular expression
+    :returns: The compiled pattern
+    """
+    return re.compile(pattern)
+
+
+def _media_name(media: Union[Image, Video]) -> str:
+    """ Get the name of an Image or Video
+
+    :param media: The Image or Video
+    :returns: The media name
+    """
+    return media.video_name if isinstance(media, Video) else media.image_name
+
+
+class _MediaList(list):
+    """ A list of Images or Videos that counts its changes
+
+    The Dataset rebuilds its media indexes when the version changed.
+
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+
+def _count_changes(method):
+    @wraps(method)
+    def changing_method(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    return changing_method
+
+
+for _method_name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+                     "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_MediaList, _method_name, _count_changes(getattr(list, _method_name)))
+
 
 class Dataset:
     """ The Dataset class is the model of a DataGym.io Dataset
@@ -25,19 +74,68 @@ class Dataset:
         self.owner = data['owner']
 
         self.media_type = data['mediaType']
-        if 'media' in data:
-            if self.media_type == "IMAGE":
-                self.media: List[Image] = [Image(media_data) for media_data in data['media']]
-                self.images = self.media
-            elif self.media_type == "VIDEO":
-                self.media: List[Video] = [Video(media_data) for media_data in data['media']]
-                self.images = None
-            else:
-                self.media = []
-                self.images = None
-        else:
-            self.media = []
-            self.images = None
+
+        # The media models are built from the raw media data on first access
+        self._media_data: Optional[List[Dict]] = data.get('media', [])
+        self._media: Optional[List[Union[Image, Video]]] = None
+
+        self._media_index_version: Optional[int] = None
+        self._media_by_name: Dict[str, List[Union[Image, Video]]] = {}
+        self._media_by_id: Dict[str, Union[Image, Video]] = {}
+
+    @property
+    def media(self) -> List[Union[Image, Video]]:
+        """ The Images or Videos of this Dataset, built on first access
+
+        :returns: List of Images or Videos
+        :rtype: List[Image|Video]
+
+        """
+        if self._media is None:
+            self._media = _MediaList(self.iter_media())
+            self._media_data = None
+        return self._media
+
+    @media.setter
+    def media(self, media: List[Union[Image, Video]]):
+        self._media = _MediaList(media)
+        self._media_data = None
+        self._media_index_version = None
+
+    @property
+    def images(self) -> Optional[List[Image]]:
+        """ The Images of an Image Dataset, None for other Datasets
+
+        :rtype: List[Image] or None
+
+        """
+        return self.media if self.media_type == "IMAGE" else None
+
+    @property
+    def media_count(self) -> int:
+        """ The number of Images or Videos, counted without building them
+
+        :rtype: int
+
+        """
+        if self._media is not None:
+            return len(self._media)
+        return len(self._media_data) if self.media_type in MEDIA_MODELS else 0
+
+    def iter_media(self) -> Iterator[Union[Image, Video]]:
+        """ Iterate over the Images or Videos of this Dataset
+
+        Before the media list is built, the models are created one at
+        a time from the raw media data and not kept.
+
+        :returns: Iterator over Images or Videos
+        :rtype: Iterator[Image|Video]
+
+        """
+        if self._media is not None:
+            return iter(self._media)
+        media_model = MEDIA_MODELS.get(self.media_type)
+        return map(media_model, self._media_data) if media_model else iter(())
 
     def __repr__(self):
         """ Return useful representation of a the Dataset
@@ -49,12 +147,13 @@ class Dataset:
 
         :return: Return readable repr of the dataset
         """
-        properties = [f"'{e[0]}': '{e[1]}'" for e in self.__dict__.items() if e[0] != "media"]
+        properties = [f"'{e[0]}': '{e[1]}'" for e in self.__dict__.items()
+                      if e[0] != "media" and not e[0].startswith("_")]
 
         if self.media_type == "IMAGE":
-            properties += ["'media': <List[Image] with {} elements>".format(len(self.media))]
+            properties += ["'media': <List[Image] with {} elements>".format(self.media_count)]
         elif self.media_type == "VIDEO":
-            properties += ["'media': <List[Video] with {} elements>".format(len(self.media))]
+            properties += ["'media': <List[Video] with {} elements>".format(self.media_count)]
         else:
             properties += "No media"
 
@@ -67,9 +166,9 @@ class Dataset:
         :return: Return readable string for the Dataset
         """
         if self.media_type == "IMAGE":
-            temp_string_repr = f'{"Images:":<18} {len(self.media)}\n'
+            temp_string_repr = f'{"Images:":<18} {self.media_count}\n'
         elif self.media_type == "VIDEO":
-            temp_string_repr = f'{"Videos:":<18} {len(self.media)}\n'
+            temp_string_repr = f'{"Videos:":<18} {self.media_count}\n'
         else:
             temp_string_repr = 'No media'
 
@@ -93,27 +192,61 @@ class Dataset:
         """
         return self.get_media_by_name(image_name, regex)
 
+    def _update_media_indexes(self) -> None:
+        """ Build the name and ID indexes of the media if the media changed
+
+        The media list counts its changes, so replacing the list or
+        adding, removing and replacing media rebuilds the indexes on
+        the next lookup. Renaming a media in place is not tracked.
+
+        """
+        if self.media.version == self._media_index_version:
+            return
+
+        self._media_by_name = {}
+        self._media_by_id = {}
+        for media in self.media:
+            self._media_by_name.setdefault(_media_name(media), []).append(media)
+            self._media_by_id[media.id] = media
+        self._media_index_version = self.media.version
+
+    def iter_media_by_name(self, media_name: str, regex: bool = False) -> Iterator[Union[Image, Video]]:
+        """ Iterate over the Media with a specific name or matching a search term
+
+        :param str media_name: Media name or search term
+        :param bool regex: If regex is True search with regular expressions
+        :returns: Iterator over the matching Media in Dataset order
+        :rtype: Iterator[Image|Video]
+
+        """
+        if regex:
+            match = _compile_pattern(media_name).match
+            return (media for media in self.media if match(_media_name(media)))
+
+        self._update_media_indexes()
+        return iter(self._media_by_name.get(media_name, ()))
+
     def get_media_by_name(self, media_name: str, regex: bool = False) -> List[Image] or List[Video] or []:
         """ Get Media by a specific name or search term
 
+        Names are looked up in an index, regular expressions are
+        compiled once and matched against the media names.
+
         :param str media_name: Media name or search term
         :param bool regex: If regex is True search with regular expressions
         :returns: List of Media from this Dataset
         :rtype: List[Image|Video]
 
         """
-        if regex:
-            r = re.compile(media_name)
-            if self.media_type == "IMAGE":
-                return [img for img in self.media if r.match(img.image_name)]
-            elif self.media_type == "VIDEO":
-                return [vid for vid in self.media if r.match(vid.video_name)]
-            else:
-                return []
-        else:
-            if self.media_type == "IMAGE":
-                return [img for img in self.media if img.image_name == media_name]
-            elif self.media_type == "VIDEO":
-                return [vid for vid in self.media if vid.video_name == media_name]
-            else:
-                return []
+        return list(self.iter_media_by_name(media_name, regex))
+
+    def get_media_by_id(self, media_id: str) -> Image or Video or None:
+        """ Get Media by its ID
+
+        :param str media_id: The Media ID
+        :returns: The Media with the given ID
+        :rtype: Image|Video or None
+
+        """
+        self._update_media_indexes()
+        return self._media_by_id.get(media_id)
@@ -1,3 +1,4 @@
+import sys
 from typing import Dict
 
 
@@ -9,6 +10,9 @@ class Image:
 
     """
 
+    # Slots instead of an instance __dict__ keep large Datasets small in memory
+    __slots__ = ("id", "image_name", "image_type", "timestamp")
+
     def __init__(self, data: Dict):
         """ Initializes DataGym Image instance
 
@@ -17,7 +21,8 @@ class Image:
         """
         self.id = data['id']
         self.image_name = data['mediaName']
-        self.image_type = data['mediaSourceType']
+        # Share the few distinct source types between all Images
+        self.image_type = sys.intern(data['mediaSourceType'])
         self.timestamp = data['timestamp']
 
     def __repr__(self):
@@ -28,7 +33,8 @@ class Image:
 
         :return: Return readable repr of the Image
         """
-        return f'<Image {self.__dict__}>'
+        properties = {slot: getattr(self, slot) for slot in self.__slots__}
+        return f'<Image {properties}>'
 
     def __str__(self):
         """ Return useful representation of a the Image when called with print()
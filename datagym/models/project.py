@@ -1,5 +1,5 @@
 from datagym.models.dataset import Dataset
-from typing import List, Dict
+from typing import List, Dict, Callable, Optional
 
 
 class Project:
@@ -24,7 +24,8 @@ class Project:
         self.label_iteration_id: str = data['labelIterationId']
         self.owner: str = data['owner']
 
-        self.datasets: List[Dataset] = [Dataset(d) for d in data['datasets']]
+        self._datasets: List[Dataset] = [Dataset(d) for d in data['datasets']]
+        self._dataset_loader: Optional[Callable[[str], Optional[Dataset]]] = None
         self.media_type: str = data['mediaType']
 
     def __repr__(self):
@@ -37,8 +38,9 @@ class Project:
 
         :return: Return readable repr of the Project
         """
-        properties = [f"'{e[0]}': '{e[1]}'" for e in self.__dict__.items() if e[0] != "datasets"]
-        properties += ["'datasets': <List[Dataset] with {} elements>".format(len(self.datasets))]
+        properties = [f"'{e[0]}': '{e[1]}'" for e in self.__dict__.items() if not e[0].startswith("_")]
+        # The number of Datasets is known without loading them
+        properties += ["'datasets': <List[Dataset] with {} elements>".format(len(self._datasets))]
         r = "<{class_name} {{{properties}}}>".format(properties=", ".join(properties),
                                                      class_name=self.__class__.__name__)
         return r
@@ -58,6 +60,40 @@ class Project:
                       f'{40 * "-"}\n' + datasets_string_repr
         return string_repr
 
+    @property
+    def datasets(self) -> List[Dataset]:
+        """ The Datasets of this Project
+
+        With a dataset loader the Datasets are fetched with their
+        media when they are accessed for the first time.
+
+        :returns: List of Datasets
+        :rtype: List[Dataset]
+
+        """
+        if self._dataset_loader is not None:
+            # Keep the Dataset without media if it can not be loaded
+            self._datasets = [self._dataset_loader(d.id) or d for d in self._datasets]
+            self._dataset_loader = None
+        return self._datasets
+
+    @datasets.setter
+    def datasets(self, datasets: List[Dataset]):
+        self._datasets = datasets
+        self._dataset_loader = None
+
+    def set_dataset_loader(self, dataset_loader: Callable[[str], Optional[Dataset]]):
+        """ Load the Datasets of this Project lazily
+
+        The api/v1/project endpoint returns Projects with Datasets but
+        without media. The dataset_loader fetches a Dataset with media
+        by its ID once the datasets of this Project are accessed.
+
+        :param Callable dataset_loader: Function that fetches a Dataset by its ID
+
+        """
+        self._dataset_loader = dataset_loader
+
     def update_existing_datasets(self, dataset_list: List[Dataset]):
         """ Update a Project with a list of Datasets
 
@@ -70,7 +106,7 @@ class Project:
         :param List[Dataset] dataset_list: List of Datasets
 
         """
-        dataset_ids = [d.id for d in self.datasets]
+        dataset_ids = [d.id for d in self._datasets]
         self.datasets = [d for d in dataset_list if d.id in dataset_ids]
 
     def get_dataset_by_name(self, dataset_name: str) -> Dataset or None:
@@ -124,9 +160,22 @@ class Project:
         :rtype: List[Image|Video]
 
         """
-        media_list = []
+        return [media for dataset in self.datasets for media in dataset.iter_media_by_name(media_name, regex)]
+
+    def get_media_by_id(self, media_id: str):
+        """ Get Media by its ID
 
+        The ID indexes of the Datasets are used, so a lookup costs
+        one dictionary access per Dataset.
+
+        :param str media_id: The Media ID
+        :returns: The Media with the given ID
+        :rtype: Image|Video or None
+
+        """
         for dataset in self.datasets:
-            media_list += dataset.get_media_by_name(media_name, regex)
+            media = dataset.get_media_by_id(media_id)
+            if media is not None:
+                return media
 
-        return media_list
+        return None
@@ -1,3 +1,4 @@
+import sys
 from typing import Dict
 
 
@@ -9,6 +10,9 @@ class Video:
 
     """
 
+    # Slots instead of an instance __dict__ keep large Datasets small in memory
+    __slots__ = ("id", "video_name", "video_type", "timestamp")
+
     def __init__(self, data: Dict):
         """ Initializes DataGym Video instance
 
@@ -17,7 +21,8 @@ class Video:
         """
         self.id = data['id']
         self.video_name = data['mediaName']
-        self.video_type = data['mediaSourceType']
+        # Share the few distinct source types between all Videos
+        self.video_type = sys.intern(data['mediaSourceType'])
         self.timestamp = data['timestamp']
 
     def __repr__(self):
@@ -27,7 +32,8 @@ class Video:
 
         :return: Return readable repr of the Video
         """
-        return f'<Video {self.__dict__}>'
+        properties = {slot: getattr(self, slot) for slot in self.__slots__}
+        return f'<Video {properties}>'
 
     def __str__(self):
         """ Return useful representation of a the Video when called with print()
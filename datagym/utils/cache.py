@@ -0,0 +1,65 @@
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    The TTLCache keeps values for a limited time (time to live) after they were stored.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """
+        :param float ttl: Seconds a value stays valid, 0 disables the cache
+        """
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value if it is stored and not expired
+        :param key: The cache key
+        :return: The cached value or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            # Another thread may have expired the same key already
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def get_entry(self, key: Hashable) -> Tuple[Optional[Any], bool]:
+        """
+        Get a value also if it is expired, ex. to revalidate it. An expired value
+        stays stored until it is replaced or invalidated.
+        :param key: The cache key
+        :return: (value or None, True if the value is not expired)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        stored_at, value = entry
+        return value, time.monotonic() - stored_at <= self.ttl
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, a disabled cache stores nothing
+        :param key: The cache key
+        :param value: The value
+        :return: None
+        """
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """
+        Remove a value or, without key, all values
+        :param key: The cache key
+        :return: None
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+
+class BatchJournal:
+    """
+    The BatchJournal records completed mini batches in a local file, so an
+    interrupted upload can be resumed without sending them again.
+    The first line of the file holds the batch size, each further line the offset,
+    size and fingerprint of one completed mini batch.
+    """
+
+    def __init__(self, file_path: Union[str, Path], batch_size: int) -> None:
+        """
+        :param file_path: Path of the journal file, it is created on the first completed mini batch
+        :param int batch_size: The number of items per mini batch, has to match the journal file
+        :raises ValueError: If the journal file was written with another batch size
+        """
+        self.file_path = Path(file_path)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._completed = self._read()
+
+    def _read(self) -> Dict[int, Tuple[int, str]]:
+        """
+        Read the completed mini batches from the journal file
+        :return: Dictionary of offset to (size, fingerprint)
+        """
+        completed = {}
+        if self.file_path.exists():
+            with open(self.file_path, 'r') as journal:
+                header = journal.readline().split()
+                if header and header != ['batch_size', str(self.batch_size)]:
+                    raise ValueError(f'The journal "{self.file_path}" was not written with batch size '
+                                     f'{self.batch_size}, delete it to start a new upload')
+                for line in journal:
+                    # A line may be incomplete if the last run was killed while writing it
+                    try:
+                        offset, size, fingerprint = line.split()
+                        completed[int(offset)] = (int(size), fingerprint)
+                    except ValueError:
+                        continue
+        return completed
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+    @staticmethod
+    def fingerprint(mini_batch: List) -> str:
+        """
+        Hash the items of a mini batch
+        :param List mini_batch: The JSON serializable items
+        :return: The hex digest of the items
+        """
+        return hashlib.blake2b(json.dumps(mini_batch, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+    def is_completed(self, offset: int, size: int, fingerprint: str) -> bool:
+        """
+        Check if a mini batch was already completed
+        :param int offset: Index of the first item of the mini batch
+        :param int size: Number of items in the mini batch
+        :param str fingerprint: The fingerprint of the items
+        :return: True if the mini batch is recorded in the journal
+        :raises ValueError: If another mini batch was recorded at the offset
+        """
+        recorded = self._completed.get(offset)
+        if recorded is None:
+            return False
+        if recorded != (size, fingerprint):
+            raise ValueError(f'The journal "{self.file_path}" belongs to other items at offset {offset}, '
+                             f'delete it to start a new upload')
+        return True
+
+    def record(self, offset: int, size: int, fingerprint: str) -> None:
+        """
+        Append a completed mini batch to the journal file
+        :param int offset: Index of the first item of the mini batch
+        :param int size: Number of items in the mini batch
+        :param str fingerprint: The fingerprint of the items
+        :return: None
+        """
+        with self._lock:
+            with open(self.file_path, 'a') as journal:
+                if journal.tell() == 0:
+                    journal.write(f'batch_size {self.batch_size}\n')
+                journal.write(f'{offset} {size} {fingerprint}\n')
+            self._completed[offset] = (size, fingerprint)
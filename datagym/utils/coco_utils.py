@@ -1,4 +1,4 @@
-from typing import AnyStr, Dict
+from typing import AnyStr, Dict, List
 import numpy as np
 
 
@@ -11,19 +11,90 @@ def add_to_dict_valuelist(dictionary: Dict, key: AnyStr, value) -> Dict:
     return dictionary
 
 
+def rleCountsFromString(s) -> List[int]:
+    """
+    Decode the counts of a compressed RLE string (as written by the COCO API).
+    :param   s (str or bytes)  : compressed run-length counts
+    :return: counts (List[int]): run-length counts
+    """
+    if isinstance(s, str):
+        s = s.encode('ascii')
+    counts = []
+    p = 0
+    while p < len(s):
+        x = 0
+        k = 0
+        more = True
+        while more:
+            c = s[p] - 48
+            x |= (c & 0x1f) << 5 * k
+            more = c & 0x20
+            p += 1
+            k += 1
+            if not more and (c & 0x10):
+                x |= -1 << 5 * k
+        if len(counts) > 2:
+            x += counts[-2]
+        counts.append(x)
+    return counts
+
+
 def decodeMask(R):
     """
     Decode binary mask M encoded via run-length encoding.
-    :param   R (object RLE)    : run-length encoding of binary mask
+    :param   R (object RLE)    : run-length encoding of binary mask, counts as list or compressed string
     :return: M (bool 2D array) : decoded binary mask
     """
-    N = len(R['counts'])
-    M = np.zeros((R['size'][0]*R['size'][1], ), dtype=np.uint8)
-    n = 0
-    val = 1
-    for pos in range(N):
-        val = not val
-        for c in range(R['counts'][pos]):
-            M[n] = val
-            n += 1
-    return M.reshape((R['size']), order='F')
+    h, w = R['size']
+    counts = R['counts']
+    if isinstance(counts, (str, bytes)):
+        counts = rleCountsFromString(counts)
+    counts = np.asarray(counts, dtype=np.int64)
+
+    # Runs alternate between 0 and 1, starting with 0
+    values = (np.arange(len(counts)) % 2).astype(np.uint8)
+    runs = np.repeat(values, counts)
+    if runs.size > h * w:
+        raise IndexError('RLE counts exceed the mask size')
+
+    M = np.zeros((h * w, ), dtype=np.uint8)
+    M[:runs.size] = runs
+    return M.reshape((h, w), order='F')
+
+
+def decodeMasks(Rs: List) -> np.ndarray:
+    """
+    Decode multiple binary masks of the same size encoded via run-length encoding at once.
+    :param   Rs (List[object RLE]): run-length encodings of binary masks
+    :return: M (3D array)         : decoded binary masks with shape (h, w, n)
+    """
+    if not Rs:
+        return np.zeros((0, 0, 0), dtype=np.uint8)
+    h, w = Rs[0]['size']
+    if any(tuple(R['size']) != (h, w) for R in Rs):
+        raise ValueError('All RLE masks have to be of the same size')
+
+    counts = [rleCountsFromString(R['counts']) if isinstance(R['counts'], (str, bytes)) else R['counts']
+              for R in Rs]
+    lengths = np.array([len(c) for c in counts], dtype=np.int64)
+    all_counts = np.concatenate([np.asarray(c, dtype=np.int64) for c in counts])
+
+    # Position of every run end within its own mask
+    mask_index = np.repeat(np.arange(len(Rs)), lengths)
+    first_run = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    cumulative = np.cumsum(all_counts)
+    before_mask = np.concatenate(([0], cumulative))[first_run]
+    ends = cumulative - np.repeat(before_mask, lengths)
+    last_run = np.cumsum(lengths)[lengths > 0] - 1
+    if (ends[last_run] > h * w).any():
+        raise IndexError('RLE counts exceed the mask size')
+
+    # Every second run is a run of ones: mark its start with +1 and its end with -1
+    ones = (np.arange(len(all_counts)) - np.repeat(first_run, lengths)) % 2 == 1
+    offsets = mask_index[ones] * (h * w)
+    delta = np.zeros((h * w * len(Rs) + 1, ), dtype=np.int64)
+    np.add.at(delta, offsets + ends[ones] - all_counts[ones], 1)
+    np.add.at(delta, offsets + ends[ones], -1)
+
+    M = np.cumsum(delta[:-1]).astype(np.uint8)
+    return M.reshape((h, w, len(Rs)), order='F')
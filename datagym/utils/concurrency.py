@@ -0,0 +1,75 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator, List
+
+
+def bounded_map(executor: Executor, fn: Callable, iterable: Iterable, max_in_flight: int) -> Iterator:
+    """
+    Map fn over iterable on an executor and yield the results in input order.
+    In contrast to Executor.map the iterable is consumed lazily and at most
+    max_in_flight calls are pending at any time.
+    :param Executor executor: The executor running the calls
+    :param Callable fn: The function to call for each item
+    :param Iterable iterable: The items
+    :param int max_in_flight: Maximum number of submitted but not yet yielded calls
+    :return: Iterator over the results of fn in input order
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def async_bounded_map(fn: Callable[..., Awaitable],
+                            iterable: Iterable,
+                            max_in_flight: int,
+                            cancel_pending: bool = True) -> AsyncIterator:
+    """
+    The asyncio counterpart of bounded_map: run the coroutine function fn for every item
+    as task and yield the results in input order. At most max_in_flight tasks are pending,
+    the pending tasks are cancelled if the iteration stops early or is cancelled.
+    :param Callable fn: The coroutine function to call for each item
+    :param Iterable iterable: The items
+    :param int max_in_flight: Maximum number of started but not yet yielded tasks
+    :param bool cancel_pending: Cancel the pending tasks on an early stop, else wait until they are done.
+        Use False for calls that must not be interrupted once started, ex. writes.
+    :return: Async iterator over the results of fn in input order
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(asyncio.ensure_future(fn(item)))
+            if len(pending) >= max_in_flight:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        if cancel_pending:
+            for task in pending:
+                task.cancel()
+        elif pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """
+    Split an iterable lazily into lists of at most size items
+    :param Iterable iterable: The items
+    :param int size: The maximum number of items per list
+    :return: Iterator over the lists
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,83 @@
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple, Union
+
+# JPEG start of frame markers, without DHT (0xC4), JPG (0xC8) and DAC (0xCC)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def read_image_size(image_path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """
+    Read the size of a JPEG, PNG, GIF or BMP image from its header without decoding the pixels.
+    Like cv2.imread, the EXIF orientation of JPEG images is applied.
+    :param image_path: The image file
+    :return: The size (w, h) or None if the format is not supported or the header is broken
+    """
+    with open(image_path, 'rb') as image_file:
+        head = image_file.read(26)
+        try:
+            if head.startswith(b'\xff\xd8'):
+                image_file.seek(2)
+                return _read_jpeg_size(image_file)
+            if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                return struct.unpack('>II', head[16:24])
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                return struct.unpack('<HH', head[6:10])
+            if head.startswith(b'BM'):
+                width, height = struct.unpack('<ii', head[18:26])
+                return width, abs(height)
+        except struct.error:
+            return None
+    return None
+
+
+def _read_jpeg_size(image_file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    Walk the JPEG segments up to the start of frame
+    :param BinaryIO image_file: The file positioned after the SOI marker
+    :return: The size (w, h) or None
+    """
+    orientation = 1
+    while True:
+        byte = image_file.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = image_file.read(1)
+        while marker == b'\xff':
+            marker = image_file.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        # Standalone markers without a segment
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+
+        length, = struct.unpack('>H', image_file.read(2))
+        segment = image_file.read(length - 2)
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', segment[1:5])
+            # Orientations 5 to 8 rotate the image by 90 degrees
+            return (height, width) if orientation >= 5 else (width, height)
+        if marker == 0xE1 and segment.startswith(b'Exif\x00\x00'):
+            orientation = _read_exif_orientation(segment[6:])
+
+
+def _read_exif_orientation(tiff: bytes) -> int:
+    """
+    Read the orientation tag of the first EXIF image file directory
+    :param bytes tiff: The TIFF structure of the EXIF segment
+    :return: The EXIF orientation, 1 if it is missing
+    """
+    byte_order = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if byte_order is None:
+        return 1
+    offset, = struct.unpack(byte_order + 'I', tiff[4:8])
+    count, = struct.unpack(byte_order + 'H', tiff[offset:offset + 2])
+    for entry in range(offset + 2, offset + 2 + 12 * count, 12):
+        tag, _, _, value = struct.unpack(byte_order + 'HHIH', tiff[entry:entry + 10])
+        if tag == _EXIF_ORIENTATION_TAG:
+            return value
+    return 1
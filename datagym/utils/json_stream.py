@@ -0,0 +1,140 @@
+import codecs
+import json
+from typing import Iterable, Iterator, Union, Any, BinaryIO, Tuple
+
+JSON_WHITESPACE = ' \t\n\r'
+
+
+class JsonStreamReader:
+    """
+    The JsonStreamReader parses JSON documents from an iterable of chunks.
+    Only the part of the document that is currently parsed is kept in memory.
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]) -> None:
+        """
+        :param Iterable chunks: The document as consecutive bytes or str chunks
+        """
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """
+        Append the next chunk to the buffer and drop the already parsed prefix
+        :return: False if the document is exhausted
+        """
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._utf8.decode(b'', final=True)
+        else:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it
+        :return: The next character or '' at the end of the document
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, characters: str) -> str:
+        """
+        Consume the next non-whitespace character
+        :param str characters: The allowed characters
+        :return: The consumed character
+        """
+        char = self.peek()
+        if not char or char not in characters:
+            raise ValueError(f'Expected one of "{characters}" at JSON stream position, got "{char}"')
+        self._pos += 1
+        return char
+
+    def read_value(self) -> Any:
+        """
+        Parse the next complete JSON value
+        :return: The parsed value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A value that ends with the buffer (ex. a number) may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Parse a JSON array and yield its elements one by one
+        :return: Iterator over the array elements
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.expect(',]') == ']':
+                return
+
+    def iter_object(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Parse a JSON object and yield its members one by one.
+        Array values are yielded as iterators over their elements, elements
+        that are not consumed before the next member is requested are skipped.
+        :return: Iterator over (key, value) pairs
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            if self.peek() == '[':
+                elements = self.iter_array()
+                yield key, elements
+                for _ in elements:
+                    pass
+            else:
+                yield key, self.read_value()
+            if self.expect(',}') == '}':
+                return
+
+
+def iter_json_file_chunks(file: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Read a binary file in chunks for the JsonStreamReader
+    :param BinaryIO file: The opened file
+    :param int chunk_size: The number of bytes read at once
+    :return: Iterator over the chunks
+    """
+    return iter(lambda: file.read(chunk_size), b'')
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array without loading the whole document
+    :param Iterable chunks: The document as consecutive bytes or str chunks
+    :return: Iterator over the array elements
+    """
+    return JsonStreamReader(chunks).iter_array()
@@ -1,12 +1,12 @@
 import sys
-from typing import Iterable
+from typing import Iterable, Optional
 
 
-def progressbar(it: Iterable, prefix: str = "", size: int = 60):
-    count = len(it)
+def progressbar(it: Iterable, prefix: str = "", size: int = 60, total: Optional[int] = None):
+    count = len(it) if total is None else total
 
     def show(j: int):
-        x = int(size*j/count)
+        x = int(size*j/count) if count else size
         print("\r%s[%s%s] %i/%i" % (prefix, "#"*x, "."*(size-x), j, count), end='')
         sys.stdout.flush()
 
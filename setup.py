@@ -17,6 +17,10 @@ requirements = [
 
 test_requirements = ['pytest>=3', ]
 
+extra_requirements = {
+    'async': ['aiohttp>=3.6'],
+}
+
 setuptools.setup(
    name='datagym',
    version='0.7.2',
@@ -40,6 +44,7 @@ setuptools.setup(
    url='https://www.datagym.ai/',
    packages=setuptools.find_packages(include=['datagym', 'datagym.*']),
    install_requires=requirements,
+   extras_require=extra_requirements,
    test_suite='tests',
    tests_require=test_requirements,
    include_package_data=True
@@ -0,0 +1,187 @@
+import asyncio
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+
+class TestAsyncClient:
+
+    @pytest.fixture
+    def state(self):
+        return {"in_flight": 0, "max_in_flight": 0, "datasets": []}
+
+    @pytest.fixture
+    def app(self, state):
+        def dataset(dataset_id, media):
+            return {"id": dataset_id, "name": dataset_id, "shortDescription": "", "timestamp": 1,
+                    "owner": "user1", "mediaType": "IMAGE", "media": media}
+
+        async def projects(request):
+            return web.json_response([
+                {"id": project_id, "name": name, "shortDescription": "", "timestamp": 122345,
+                 "labelConfigurationId": "LABELID1", "labelIterationId": "LABELITERID1", "owner": "user1",
+                 "mediaType": "IMAGE", "datasets": [dataset(d, []) for d in dataset_ids]}
+                for project_id, name, dataset_ids in [("ID1", "Project1", ["D1", "D2"]), ("ID2", "Project2", ["D1"])]
+            ])
+
+        async def datasets(request):
+            state["datasets"].append(None)
+            return web.json_response([])
+
+        async def dataset_by_id(request):
+            dataset_id = request.match_info["dataset_id"]
+            state["datasets"].append(dataset_id)
+            media = {"id": f"{dataset_id}-I", "mediaName": "a.jpg", "mediaSourceType": "LOCAL", "timestamp": 1}
+            return web.json_response(dataset(dataset_id, [media]))
+
+        async def export(request):
+            base = str(request.url.origin()) + "/"
+            return web.json_response([{"project": "Project1"}] + [
+                {"internal_media_ID": f"M{i}", "task_export_url": f"{base}task/{i}"} for i in range(20)
+            ])
+
+        async def task(request):
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return web.json_response({"task": request.match_info["task_id"]})
+
+        async def urls(request):
+            body = await request.json()
+            if "fail" in body:
+                error = {"key": "ex_alreadyexists", "params": ["Image", "url", "fail"], "code": 400}
+                return web.json_response(error, status=400)
+            if "broken" in body:
+                return web.json_response({"key": "ex_unknown", "params": [], "msg": "Broken", "code": 400},
+                                         status=400)
+            return web.json_response([{"url": url} for url in body])
+
+        async def media(request):
+            return web.Response(body=bytes(range(256)) * 1000)
+
+        app = web.Application()
+        app.router.add_get("/api/v1/project", projects)
+        app.router.add_get("/api/v1/dataset", datasets)
+        app.router.add_get("/api/v1/dataset/{dataset_id}", dataset_by_id)
+        app.router.add_get("/api/v1/export/{project_id}", export)
+        app.router.add_get("/task/{task_id}", task)
+        app.router.add_post("/api/v1/media/{dataset_id}/url", urls)
+        app.router.add_get("/api/v1/media/{media_id}", media)
+        return app
+
+    @pytest.fixture
+    def run(self, app):
+        from datagym import AsyncClient
+
+        def run(test, **kwargs):
+            async def main():
+                async with TestServer(app) as server:
+                    async with AsyncClient("38641a09-cdf1-448e-bbc6-8e49109f7b63",
+                                           base_url=str(server.make_url("/")), **kwargs) as client:
+                        return await test(client)
+
+            return asyncio.run(main())
+
+        return run
+
+    def test_get_projects(self, run, state):
+        async def test(client):
+            return await client.get_projects()
+
+        projects = run(test)
+        assert [project.name for project in projects] == ["Project1", "Project2"]
+        assert [d.media[0].id for d in projects[0].datasets] == ["D1-I", "D2-I"]
+        assert projects[1].datasets[0] is projects[0].datasets[0]
+        # Only the Datasets of the Projects are fetched, each once
+        assert sorted(state["datasets"]) == ["D1", "D2"]
+
+    def test_export_labels_bounded_concurrency(self, run, state):
+        async def test(client):
+            return await client.export_labels("P1")
+
+        export = run(test, max_concurrency=3)
+        assert [media["labels"]["task"] for media in export[1:]] == [str(i) for i in range(20)]
+        assert 1 < state["max_in_flight"] <= 3
+
+    def test_create_images_from_urls_batches(self, run):
+        urls = [f"https://example.com/{i}.jpg" for i in range(40)]
+        urls[7] = "fail"
+
+        async def test(client):
+            stopped = await client.create_images_from_urls("D1", urls, batch_size=5)
+            continued = await client.create_images_from_urls("D1", urls, batch_size=5, stop_on_failure=False)
+            return stopped, continued
+
+        stopped, continued = run(test, max_concurrency=2)
+        # The mini batches sent before the failure was seen are merged, no further ones are sent
+        assert [entry["url"] for entry in stopped] == urls[:5] + urls[10:25]
+        assert [entry["url"] for entry in continued] == urls[:5] + urls[10:]
+
+    def test_shares_exception_mapping(self, run):
+        from datagym import ClientException
+
+        async def test(client):
+            await client.create_images_from_urls("D1", ["broken"])
+
+        with pytest.raises(ClientException, match="Broken"):
+            run(test)
+
+    def test_download_image_streams_to_file(self, run, tmp_path):
+        from datagym import Image
+        image = Image({"id": "ID1", "mediaName": "image.jpg", "mediaSourceType": "LOCAL", "timestamp": 1})
+
+        async def test(client):
+            await client.download_image(image, tmp_path)
+            return await client.download_image_bytes(image)
+
+        content = run(test)
+        assert (tmp_path / "image.jpg").read_bytes() == content == bytes(range(256)) * 1000
+        assert not list(tmp_path.glob("*.part"))
+
+
+class TestAsyncBoundedMap:
+
+    def test_cancel_pending_tasks_on_early_stop(self):
+        from datagym.utils.concurrency import async_bounded_map
+        started, cancelled = [], []
+
+        async def work(i):
+            started.append(i)
+            try:
+                await asyncio.sleep(0.01 if i == 0 else 1)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+            return i
+
+        async def main():
+            results = async_bounded_map(work, range(100), 4)
+            first = await results.__anext__()
+            await results.aclose()
+            await asyncio.sleep(0)
+            return first
+
+        assert asyncio.run(main()) == 0
+        assert started == [0, 1, 2, 3]
+        assert sorted(cancelled) == [1, 2, 3]
+
+    def test_wait_for_pending_tasks_on_early_stop(self):
+        from datagym.utils.concurrency import async_bounded_map
+        finished = []
+
+        async def work(i):
+            await asyncio.sleep(0.01)
+            finished.append(i)
+            return i
+
+        async def main():
+            results = async_bounded_map(work, range(100), 4, cancel_pending=False)
+            first = await results.__anext__()
+            await results.aclose()
+            return first
+
+        assert asyncio.run(main()) == 0
+        assert sorted(finished) == [0, 1, 2, 3]
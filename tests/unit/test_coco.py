@@ -0,0 +1,317 @@
+import json
+import numpy as np
+import pytest
+
+from datagym.utils.coco_utils import decodeMask, decodeMasks, rleCountsFromString
+
+
+def decode_mask_reference(R):
+    M = np.zeros((R['size'][0] * R['size'][1], ), dtype=np.uint8)
+    n = 0
+    val = 1
+    for count in R['counts']:
+        val = not val
+        for _ in range(count):
+            M[n] = val
+            n += 1
+    return M.reshape((R['size']), order='F')
+
+
+def encode_counts(counts):
+    """ Compress RLE counts like the COCO API does """
+    s = []
+    for i, x in enumerate(counts):
+        if i > 2:
+            x -= counts[i - 2]
+        more = True
+        while more:
+            c = x & 0x1f
+            x >>= 5
+            more = not (x == 0 and not c & 0x10) and not (x == -1 and c & 0x10)
+            if more:
+                c |= 0x20
+            s.append(chr(c + 48))
+    return "".join(s)
+
+
+@pytest.fixture
+def rles():
+    rng = np.random.default_rng(0)
+    result = []
+    for _ in range(5):
+        counts = [int(c) for c in rng.integers(0, 27, size=rng.integers(1, 12))]
+        result.append({'size': [20, 15], 'counts': counts})
+    return result
+
+
+class TestCocoUtils:
+
+    def test_decode_mask_matches_reference(self, rles):
+        for rle in rles:
+            assert np.array_equal(decodeMask(rle), decode_mask_reference(rle))
+
+    def test_decode_mask_compressed_counts(self, rles):
+        for rle in rles:
+            assert rleCountsFromString(encode_counts(rle['counts'])) == rle['counts']
+            compressed = {'size': rle['size'], 'counts': encode_counts(rle['counts'])}
+            assert np.array_equal(decodeMask(compressed), decode_mask_reference(rle))
+
+    def test_decode_masks_batch(self, rles):
+        masks = decodeMasks(rles)
+        assert masks.shape == (20, 15, len(rles))
+        for i, rle in enumerate(rles):
+            assert np.array_equal(masks[:, :, i], decode_mask_reference(rle))
+
+
+@pytest.fixture
+def instances_data():
+    mask = np.zeros((30, 40), dtype=np.uint8)
+    mask[5:15, 8:30] = 1
+    mask[20:28, 2:9] = 1
+    flat = mask.ravel(order='F')
+    changes = np.flatnonzero(np.diff(np.concatenate(([0], flat, [0]))) != 0)
+    counts = np.diff(np.concatenate(([0], changes, [flat.size]))).tolist()
+    counts = [c for c in counts if c]
+    return {
+        "images": [{"id": i, "file_name": f"{i}.jpg", "width": 40, "height": 30} for i in range(3)],
+        "categories": [
+            {"id": 1, "name": "person", "supercategory": "human"},
+            {"id": 2, "name": "car", "supercategory": "vehicle"},
+        ],
+        "annotations": [
+            {"id": 10 + i, "image_id": i % 3, "category_id": 1 + i % 2, "iscrowd": i % 2,
+             "bbox": [i, i + 0.5, 10, 12],
+             "segmentation": {"size": [30, 40], "counts": counts} if i % 2 else [[1.5, 2, 10, 2, 10, 8.25, 1, 8]]}
+            for i in range(12)
+        ],
+    }
+
+
+class TestCoco:
+
+    def test_polygons_parallel_matches_serial(self, instances_data):
+        from datagym import Coco
+        image_ids_dict = {f"{i}.jpg": f"M{i}" for i in range(3)}
+
+        serial = Coco()
+        serial.add_object_detection_data(instances_data, polygon=True)
+        parallel = Coco()
+        parallel.add_object_detection_data(instances_data, polygon=True, num_workers=2)
+
+        serial_labels = serial.get_datagym_label_dict(image_ids_dict)
+        assert serial_labels == parallel.get_datagym_label_dict(image_ids_dict)
+        assert len(serial_labels[1]["labels"]["vehicle"]) == 4
+        first_points = [entry["geometry"][0] for entry in serial_labels[1]["labels"]["vehicle"]]
+        assert first_points == [{"x": 2, "y": 20}, {"x": 8, "y": 5}] * 2
+
+    @pytest.mark.parametrize("polygon, num_workers", [(False, 1), (True, 1), (True, 2)])
+    def test_add_object_detection_file_matches_data(self, instances_data, tmp_path, polygon, num_workers):
+        from datagym import Coco
+        image_ids_dict = {f"{i}.jpg": f"M{i}" for i in range(3)}
+        # Like the official coco files the categories come after the annotations
+        file_data = {"info": {"year": 2017}, "images": instances_data["images"],
+                     "annotations": instances_data["annotations"], "categories": instances_data["categories"]}
+        file_path = tmp_path / "instances.json"
+        file_path.write_text(json.dumps(file_data))
+
+        from_data = Coco()
+        from_data.add_object_detection_data(instances_data, polygon=polygon)
+        from_file = Coco()
+        from_file.add_object_detection_file(file_path, polygon=polygon, num_workers=num_workers)
+
+        assert from_file.get_datagym_label_dict(image_ids_dict) == from_data.get_datagym_label_dict(image_ids_dict)
+        assert from_file.instances_supercategories == {"human": ["person"], "vehicle": ["car"]}
+
+    def test_add_captions_file(self, instances_data, tmp_path):
+        from datagym import Coco
+        captions = {"images": instances_data["images"],
+                    "annotations": [{"image_id": 1, "id": 5, "caption": "A car"}]}
+        file_path = tmp_path / "captions.json"
+        file_path.write_text(json.dumps(captions))
+
+        coco = Coco()
+        coco.add_captions_file(file_path)
+        assert coco.coco_images[1].classifications == {"caption": ["A car"]}
+
+    def test_coco_image_geometry_round_trip(self):
+        from datagym.importers.coco import CocoImage
+        from datagym.importers.base import GeometryBuffer
+        image = CocoImage(file_name="0.jpg", coco_image_id=0, width=40, height=30)
+        entries = [
+            {"geometry": [{"x": 1.5, "y": 2.25}, {"x": 3.0, "y": 4.5}], "classifications": {"subcategory": ["a"]}},
+            {"geometry": [{"x": 1, "y": 2, "w": 3, "h": 4}], "classifications": {"subcategory": ["b"]}},
+            {"geometry": [{"x": 1, "y": 2.5}], "classifications": {}},
+            {"geometry": [{"x": 1, "y": 2}], "classifications": {}, "attributes": {"occluded": True}},
+        ]
+        for entry in entries:
+            image.add_annotation(entry, "group")
+
+        assert isinstance(image.geometries["group"], GeometryBuffer)
+        assert json.dumps(image.annotations) == json.dumps({"group": entries})
+
+    def test_iter_datagym_label_batches(self, instances_data):
+        from datagym import Coco
+        image_ids_dict = {f"{i}.jpg": f"M{i}" for i in range(3)}
+        coco = Coco()
+        coco.add_object_detection_data(instances_data)
+
+        batches = list(coco.iter_datagym_label_batches(image_ids_dict, batch_size=2))
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [entry for batch in batches for entry in batch] == coco.get_datagym_label_dict(image_ids_dict)
+
+    def test_bbox_columnar_conversion_keeps_order_and_types(self, instances_data):
+        from datagym import Coco
+        annotations = instances_data["annotations"]
+        for i, annotation in enumerate(annotations):
+            annotation["bbox"] = [[1.5, 2.5, 3.25, 4.0], [1, 2, 3, 4], [1, 2.5, 3, 4]][i % 3]
+
+        coco = Coco()
+        coco.add_object_detection_data(instances_data)
+
+        expected = {}
+        for annotation in annotations:
+            category = coco.category_dict[annotation["category_id"]]
+            x, y, w, h = annotation["bbox"]
+            labels = expected.setdefault(annotation["image_id"], {}).setdefault(category["supercategory"], [])
+            labels.append({"geometry": [{"x": x, "y": y, "w": w, "h": h}],
+                           "classifications": {"subcategory": [category["name"]]}})
+
+        for image_id, coco_image in coco.coco_images.items():
+            assert json.dumps(coco_image.annotations) == json.dumps(expected[image_id])
+
+    @pytest.mark.parametrize("polygon, category, count", [(False, "person", 6), (True, "car", 12)])
+    def test_annotations_share_category_classifications(self, instances_data, polygon, category, count):
+        from datagym import Coco
+        for annotation in instances_data["annotations"]:
+            annotation["bbox"] = [1.5, 2.5, 3.25, 4.0]
+        coco = Coco()
+        coco.add_object_detection_data(instances_data, polygon=polygon)
+
+        classifications = [c for coco_image in coco.coco_images.values()
+                           for geometries in coco_image.geometries.values()
+                           for c in geometries.classifications if c == {"subcategory": [category]}]
+        assert len(classifications) == count
+        assert all(c is classifications[0] for c in classifications)
+
+    def test_bbox_values_are_checked_per_bbox(self, instances_data):
+        from datagym import Coco
+        instances_data["annotations"][0]["bbox"] = [1, 2, 3, 4, 5]
+        instances_data["annotations"][1]["bbox"] = [6, 7, 8]
+        with pytest.raises(IndexError):
+            Coco().add_object_detection_data(instances_data)
+
+        # Only the first 4 values of a longer bbox are used, the next bbox keeps its values
+        instances_data["annotations"][1]["bbox"] = [6, 7, 8, 9]
+        coco = Coco()
+        coco.add_object_detection_data(instances_data)
+        first = coco.coco_images[0].annotations["human"][0]["geometry"][0]
+        second = coco.coco_images[1].annotations["vehicle"][0]["geometry"][0]
+        assert first == {"x": 1, "y": 2, "w": 3, "h": 4}
+        assert second == {"x": 6, "y": 7, "w": 8, "h": 9}
+
+    def test_unknown_category_id(self, instances_data):
+        from datagym import Coco
+        instances_data["annotations"][3]["category_id"] = 99
+        with pytest.raises(KeyError):
+            Coco().add_object_detection_data(instances_data)
+
+
+class TestImporters:
+
+    @pytest.fixture
+    def yolo_dir(self, tmp_path):
+        for i in range(40):
+            lines = [f"{i % 2} 0.5 0.5 0.25 0.5", "2 0.25 0.75 0.5 0.5"]
+            if i % 3 == 0:
+                lines.append("1 0.1 0.1 0.9 0.1 0.5 0.9")
+            (tmp_path / f"{i}.txt").write_text("\n".join(lines) + "\n")
+        (tmp_path / "classes.txt").write_text("person\ncar\ndog\n")
+        return tmp_path
+
+    def test_yolo_converts_to_pixel_rectangles(self, yolo_dir):
+        from datagym import Yolo
+        yolo = Yolo(yolo_dir, ["person", "car", "dog"], image_size=(200, 100), label_key="object")
+        labels = yolo.get_datagym_label_dict({"3.jpg": "M3"})
+        assert len(labels) == 1
+        assert labels[0]["internal_media_ID"] == "M3"
+        objects = labels[0]["labels"]["object"]
+        assert objects[0] == {"geometry": [{"x": 75.0, "y": 25.0, "w": 50.0, "h": 50.0}],
+                              "classifications": {"subcategory": ["car"]}}
+        assert objects[1]["classifications"] == {"subcategory": ["dog"]}
+        assert objects[2]["geometry"] == [{"x": 20.0, "y": 10.0}, {"x": 180.0, "y": 10.0}, {"x": 100.0, "y": 90.0}]
+
+    def test_yolo_requires_image_size(self, yolo_dir):
+        from datagym import Yolo
+        with pytest.raises(ValueError):
+            list(Yolo(yolo_dir, ["person", "car", "dog"]).iter_label_images())
+
+    def test_yolo_parallel_matches_serial(self, yolo_dir):
+        from datagym import Yolo
+        image_ids = {f"{i}.jpg": f"M{i}" for i in range(40)}
+        serial = Yolo(yolo_dir, ["person", "car", "dog"], image_size=(640, 480))
+        parallel = Yolo(yolo_dir, ["person", "car", "dog"], image_size=(640, 480), num_workers=2)
+        labels = serial.get_datagym_label_dict(image_ids)
+        assert len(labels) == 40
+        assert set(labels[0]["labels"]) <= {"person", "car", "dog"}
+        assert json.dumps(parallel.get_datagym_label_dict(image_ids)) == json.dumps(labels)
+
+    @pytest.mark.parametrize("extension", [".jpg", ".png", ".bmp"])
+    def test_yolo_reads_image_size_from_header(self, yolo_dir, tmp_path_factory, extension):
+        import cv2
+        import numpy as np
+        from datagym import Yolo
+        images_dir = tmp_path_factory.mktemp("images")
+        cv2.imwrite(str(images_dir / f"3{extension}"), np.zeros((100, 200, 3), dtype=np.uint8))
+        for path in yolo_dir.glob("*.txt"):
+            if path.name != "3.txt":
+                path.unlink()
+
+        yolo = Yolo(yolo_dir, ["person", "car", "dog"], images_dir=images_dir, image_extension=extension)
+        [label_image] = yolo.iter_label_images()
+        assert (label_image.width, label_image.height) == (200, 100)
+
+    def test_read_image_size_applies_exif_orientation(self, tmp_path):
+        import struct
+        import cv2
+        import numpy as np
+        from datagym.utils.image_size import read_image_size
+        _, jpeg = cv2.imencode(".jpg", np.zeros((100, 200, 3), dtype=np.uint8))
+        tiff = b"MM\x00\x2a" + struct.pack(">IH", 8, 1) + struct.pack(">HHIHH", 0x0112, 3, 1, 6, 0) + b"\x00" * 4
+        exif = b"Exif\x00\x00" + tiff
+        image_path = tmp_path / "rotated.jpg"
+        image_path.write_bytes(jpeg.tobytes()[:2] + b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+                               + jpeg.tobytes()[2:])
+
+        assert read_image_size(image_path) == (100, 200)
+        assert cv2.imread(str(image_path)).shape[1::-1] == (100, 200)
+
+    def test_importer_is_abstract(self):
+        from datagym.importers.base import Importer
+        with pytest.raises(TypeError):
+            Importer()
+
+    def test_pascal_voc_keeps_coordinate_types(self, tmp_path):
+        from datagym import PascalVoc
+        for i in range(10):
+            (tmp_path / f"{i}.xml").write_text(f"""<annotation>
+                <filename>{i}.jpg</filename>
+                <size><width>500</width><height>375</height><depth>3</depth></size>
+                <object><name>person</name><bndbox>
+                    <xmin>10</xmin><ymin>20</ymin><xmax>110</xmax><ymax>220</ymax>
+                </bndbox></object>
+                <object><name>car</name><bndbox>
+                    <xmin>1.5</xmin><ymin>2</ymin><xmax>11.5</xmax><ymax>12</ymax>
+                </bndbox></object>
+            </annotation>""")
+
+        image_ids = {f"{i}.jpg": f"M{i}" for i in range(10)}
+        labels = PascalVoc(tmp_path).get_datagym_label_dict(image_ids)
+        labels = sorted(labels, key=lambda entry: entry["internal_media_ID"])
+        assert labels[0]["labels"] == {
+            "person": [{"geometry": [{"x": 10, "y": 20, "w": 100, "h": 200}], "classifications": {}}],
+            "car": [{"geometry": [{"x": 1.5, "y": 2.0, "w": 10.0, "h": 10.0}], "classifications": {}}]
+        }
+        assert isinstance(labels[0]["labels"]["person"][0]["geometry"][0]["x"], int)
+
+        parallel = PascalVoc(tmp_path, num_workers=2).get_datagym_label_dict(image_ids)
+        assert sorted(parallel, key=lambda entry: entry["internal_media_ID"]) == labels
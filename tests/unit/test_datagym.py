@@ -1,3 +1,5 @@
+import io
+import json
 import pytest
 from unittest.mock import patch
 from requests.models import Response
@@ -48,8 +50,476 @@ class TestClient:
             assert projects is not None
             assert len(projects) == 1
 
+    @pytest.fixture
+    def lazy_project_request(self):
+        def dataset(dataset_id, media):
+            return {"id": dataset_id, "name": dataset_id, "shortDescription": "", "timestamp": 1,
+                    "owner": "user1", "mediaType": "IMAGE", "media": media}
+
+        def project(project_id, dataset_ids):
+            return {"id": project_id, "name": project_id, "shortDescription": "", "timestamp": 1,
+                    "labelConfigurationId": "L", "labelIterationId": "I", "owner": "user1",
+                    "mediaType": "IMAGE", "datasets": [dataset(d, []) for d in dataset_ids]}
+
+        def request(method, endpoint, **kwargs):
+            if endpoint.startswith("api/v1/project"):
+                return self.make_response([project("P1", ["D1", "D2"]), project("P2", ["D3"])])
+            dataset_id = endpoint.split("/")[3].split("?")[0]
+            media = {"id": f"{dataset_id}-I", "mediaName": "a.jpg", "mediaSourceType": "LOCAL", "timestamp": 1}
+            return self.make_response(dataset(dataset_id, [media]))
+
+        return request
+
+    def test_get_projects_loads_datasets_lazily(self, client, lazy_project_request):
+        with patch('datagym.client.Client._request', side_effect=lazy_project_request) as mock_request:
+            projects = client.get_projects()
+            assert "<List[Dataset] with 2 elements>" in repr(projects[0])
+            assert "_dataset_loader" not in repr(projects[0])
+            assert mock_request.call_count == 1
+
+            assert [d.media[0].id for d in projects[0].datasets] == ["D1-I", "D2-I"]
+            assert mock_request.call_count == 3
+            projects[0].datasets
+            assert mock_request.call_count == 3
+
+    def test_get_project_by_name_loads_only_match(self, client, lazy_project_request):
+        with patch('datagym.client.Client._request', side_effect=lazy_project_request) as mock_request:
+            project = client.get_project_by_name("P2")
+            endpoints = [c[1]["endpoint"] for c in mock_request.call_args_list]
+            assert [endpoint.split("?")[0] for endpoint in endpoints] == ["api/v1/project", "api/v1/dataset/D3"]
+            assert project.datasets[0].media[0].id == "D3-I"
+
+    def test_metadata_cache_revalidates_with_etag(self, lazy_project_request):
+        from datagym import Client
+        client = Client("38641a09-cdf1-448e-bbc6-8e49109f7b63", metadata_ttl={"projects": 60})
+        conditional = []
+
+        def request(method, endpoint, headers=None, **kwargs):
+            if headers and headers.get('If-None-Match') == '"v1"':
+                conditional.append(endpoint)
+                return self.make_response(None, 304)
+            response = lazy_project_request(method, endpoint, **kwargs)
+            response.headers['ETag'] = '"v1"'
+            return response
+
+        now = [0.0]
+        with patch('datagym.client.Client._request', side_effect=request) as mock_request, \
+                patch('datagym.utils.cache.time.monotonic', side_effect=lambda: now[0]):
+            assert client.get_project_by_name("P1").name == "P1"
+            assert client.get_project_by_name("P2").name == "P2"
+            project_calls = [c for c in mock_request.call_args_list if c[1]["endpoint"].startswith("api/v1/project")]
+            assert len(project_calls) == 1
+            # Datasets are not cached without a TTL for the 'dataset' resource
+            assert len(mock_request.call_args_list) == 4
+
+            # Expired bodies are revalidated with their ETag
+            now[0] = 61.0
+            assert client.get_project_by_name("P1").name == "P1"
+            assert [endpoint.split("?")[0] for endpoint in conditional] == ["api/v1/project"]
+
+            # Invalidated bodies are dropped together with their ETag
+            client.add_dataset("D3", "P1")
+            project = client.get_project_by_name("P2")
+            assert project.datasets[0].media[0].id == "D3-I"
+            assert len(conditional) == 1
+
+    @pytest.mark.parametrize("media_type_first", [True, False])
+    def test_iter_dataset_media_pages(self, client, media_type_first):
+        media = [{"id": f"ID{i}", "mediaName": f"{i}.mp4", "mediaSourceType": "LOCAL", "timestamp": i}
+                 for i in range(10)]
+        dataset = {"id": "D1", "name": "Dataset1", "media": media}
+        dataset = dict({"mediaType": "VIDEO"}, **dataset) if media_type_first else dict(dataset, mediaType="VIDEO")
+
+        with patch('datagym.client.Client._request', return_value=self.make_response(dataset)) as mock_request:
+            client.STREAM_CHUNK_SIZE = 16
+            pages = list(client.iter_dataset_media("D1", page_size=4))
+            assert mock_request.call_args[1]["stream"] is True
+            assert [len(page) for page in pages] == [4, 4, 2]
+            assert [video.video_name for page in pages for video in page] == [f"{i}.mp4" for i in range(10)]
+
+    def test_sync_dataset_diff(self, client, tmp_path):
+        state_file = tmp_path / "D1.json"
+        media = [{"id": f"ID{i}", "mediaName": f"{i}.jpg", "mediaSourceType": "LOCAL", "timestamp": 1}
+                 for i in range(10)]
+
+        def dataset_response(media_list):
+            return self.make_response({"id": "D1", "name": "Dataset1", "mediaType": "IMAGE", "media": media_list})
+
+        with patch('datagym.client.Client._request', return_value=dataset_response(media)):
+            diff = client.sync_dataset("D1", state_file, page_size=3)
+            assert [image.id for image in diff["added"]] == [f"ID{i}" for i in range(10)]
+            assert diff["changed"] == diff["removed"] == []
+
+        media = media[1:] + [{"id": "NEW", "mediaName": "new.jpg", "mediaSourceType": "LOCAL", "timestamp": 2}]
+        media[4] = dict(media[4], timestamp=2)
+        with patch('datagym.client.Client._request', return_value=dataset_response(media)):
+            diff = client.sync_dataset("D1", state_file, page_size=3)
+            assert [image.id for image in diff["added"]] == ["NEW"]
+            assert [image.id for image in diff["changed"]] == ["ID5"]
+            assert diff["removed"] == ["ID0"]
+
+        error = {"key": "ex_alreadyexists", "params": ["Dataset", "id", "D1"], "code": 400}
+        with patch('datagym.client.Client._request', return_value=self.make_response(error, 400)):
+            assert client.sync_dataset("D1", state_file) is None
+
+        state = json.loads(state_file.read_text())
+        assert len(state["media"]) == 10 and state["media"]["ID5"] == 2
+        assert not list(tmp_path.glob("*.part"))
+
+        with pytest.raises(ValueError):
+            client.sync_dataset("D2", state_file)
+
     def test_request_success(self, client):
-        with patch('datagym.client.requests.request') as mock_get:
+        with patch.object(client._session, 'request') as mock_get:
             mock_get.return_value.ok = True
             response = client._request("GET", "endpoint", None, None)
             assert response is not None
+
+    def test_session_connection_pool(self):
+        from datagym import Client
+        client = Client("38641a09-cdf1-448e-bbc6-8e49109f7b63", pool_size=4)
+        adapter = client._session.get_adapter(client._endpoint.BASE_PATH)
+        assert adapter._pool_maxsize == 4
+        client.close()
+
+    @staticmethod
+    def make_response(content, status_code=200):
+        the_response = Response()
+        the_response.status_code = status_code
+        the_response._content = json.dumps(content).encode()
+        the_response._content_consumed = True
+        return the_response
+
+    @staticmethod
+    def make_stream_response(content, status_code=200):
+        the_response = Response()
+        the_response.status_code = status_code
+        the_response.raw = io.BytesIO(json.dumps(content).encode())
+        return the_response
+
+    def test_streamed_responses_are_not_buffered(self, client):
+        export = [{"project": "Project1"}] + [{"internal_media_ID": f"M{i}"} for i in range(2000)]
+        media = [{"id": f"ID{i}", "mediaName": f"{i}.jpg", "mediaSourceType": "LOCAL", "timestamp": i}
+                 for i in range(2000)]
+        dataset = {"id": "D1", "name": "Dataset1", "mediaType": "IMAGE", "media": media}
+
+        export_response = self.make_stream_response(export)
+        with patch('datagym.client.Client._request', return_value=export_response):
+            client.STREAM_CHUNK_SIZE = 1024
+            records = client._iter_export_records("P1")
+            assert next(records)["internal_media_ID"] == "M0"
+            assert not export_response._content_consumed
+            assert export_response.raw.tell() < len(export_response.raw.getvalue())
+
+        dataset_response = self.make_stream_response(dataset)
+        with patch('datagym.client.Client._request', return_value=dataset_response):
+            pages = client.iter_dataset_media("D1", page_size=10)
+            assert len(next(pages)) == 10
+            assert not dataset_response._content_consumed
+            assert dataset_response.raw.tell() < len(dataset_response.raw.getvalue())
+
+    @pytest.fixture
+    def export_request(self):
+        export = [{"project": "Project1"}] + [
+            {"internal_media_ID": f"M{i}", "task_export_url": f"https://app.datagym.ai/task/{i}"}
+            for i in range(20)
+        ]
+
+        def request(method, endpoint, **kwargs):
+            if endpoint.startswith("task/"):
+                return self.make_response({"task": endpoint.split("/")[1]})
+            return self.make_response(export)
+
+        return request
+
+    def test_export_labels_concurrent_keeps_order(self, client, export_request):
+        with patch('datagym.client.Client._request', side_effect=export_request):
+            export = client.export_labels("P1", max_workers=4)
+            assert export[0] == {"project": "Project1"}
+            assert [media["labels"]["task"] for media in export[1:]] == [str(i) for i in range(20)]
+
+    def test_iter_export_labels_streams_records(self, client, export_request):
+        with patch('datagym.client.Client._request', side_effect=export_request):
+            client.STREAM_CHUNK_SIZE = 7
+            exports = client.iter_export_labels("P1")
+            first = next(exports)
+            assert first["internal_media_ID"] == "M0"
+            assert first["labels"] == {"task": "0"}
+            assert len(list(exports)) == 19
+
+    def test_export_single_video_labels_uses_cached_index(self, client, export_request):
+        with patch('datagym.client.Client._request', side_effect=export_request) as mock_request:
+            first = client.export_single_video_labels("P1", "M3")
+            second = client.export_single_video_labels("P1", "M7")
+            assert first["labels"] == {"task": "3"}
+            assert second["labels"] == {"task": "7"}
+            assert client.export_single_video_labels("P1", "unknown") == {}
+            export_calls = [c for c in mock_request.call_args_list if c[1]["endpoint"].startswith("api/v1/export")]
+            assert len(export_calls) == 1
+
+            client.invalidate_export_index("P1")
+            client.export_single_video_labels("P1", "M3")
+            export_calls = [c for c in mock_request.call_args_list if c[1]["endpoint"].startswith("api/v1/export")]
+            assert len(export_calls) == 2
+
+    @pytest.fixture
+    def url_request(self):
+        def request(method, endpoint, json=None, **kwargs):
+            if "fail" in json:
+                error = {"key": "ex_alreadyexists", "params": ["Image", "url", "fail"], "code": 400}
+                return self.make_response(error, 400)
+            return self.make_response([{"url": url} for url in json])
+
+        return request
+
+    def test_create_images_from_urls_parallel_batches(self, client, url_request):
+        urls = [f"https://example.com/{i}.jpg" for i in range(23)]
+        with patch('datagym.client.Client._request', side_effect=url_request):
+            response = client.create_images_from_urls("D1", urls, batch_size=5, max_workers=3)
+            assert [entry["url"] for entry in response] == urls
+
+    def test_create_images_from_urls_continue_on_failure(self, client, url_request):
+        urls = [f"https://example.com/{i}.jpg" for i in range(20)]
+        urls[7] = "fail"
+        with patch('datagym.client.Client._request', side_effect=url_request):
+            stopped = client.create_images_from_urls("D1", urls, batch_size=5)
+            assert [entry["url"] for entry in stopped] == urls[:5]
+
+            continued = client.create_images_from_urls("D1", urls, batch_size=5, max_workers=2,
+                                                       stop_on_failure=False)
+            assert [entry["url"] for entry in continued] == urls[:5] + urls[10:]
+
+    def test_create_images_from_urls_merges_batches_in_flight_on_failure(self, client, url_request):
+        urls = [f"https://example.com/{i}.jpg" for i in range(40)]
+        urls[7] = "fail"
+        with patch('datagym.client.Client._request', side_effect=url_request) as mock_request:
+            stopped = client.create_images_from_urls("D1", urls, batch_size=5, max_workers=2)
+            # The mini batches sent before the failure was seen are merged, no further ones are sent
+            assert mock_request.call_count == 5
+            assert [entry["url"] for entry in stopped] == urls[:5] + urls[10:25]
+
+    def test_import_label_data_resumes_from_checkpoint(self, client, url_request, tmp_path):
+        labels = [f"label{i}" for i in range(20)]
+        labels[12] = "fail"
+        checkpoint = tmp_path / "import.journal"
+        with patch('datagym.client.Client._request', side_effect=url_request) as mock_request:
+            client.import_label_data("P1", labels, batch_size=5, max_workers=2,
+                                     checkpoint_file=checkpoint, stop_on_failure=False)
+            assert mock_request.call_count == 4
+
+            labels[12] = "label12"
+            resumed = client.import_label_data("P1", labels, batch_size=5, max_workers=2,
+                                               checkpoint_file=checkpoint)
+            assert mock_request.call_count == 5
+            assert [entry["url"] for entry in resumed] == labels[10:15]
+
+    def test_import_label_data_rejects_mismatching_checkpoint(self, client, url_request, tmp_path):
+        labels = [f"label{i}" for i in range(20)]
+        checkpoint = tmp_path / "import.journal"
+        with patch('datagym.client.Client._request', side_effect=url_request):
+            client.import_label_data("P1", labels, batch_size=5, checkpoint_file=checkpoint)
+
+            with pytest.raises(ValueError, match="batch size"):
+                client.import_label_data("P1", labels, batch_size=10, checkpoint_file=checkpoint)
+
+            labels[3] = "other"
+            with pytest.raises(ValueError, match="other items"):
+                client.import_label_data("P1", labels, batch_size=5, checkpoint_file=checkpoint)
+
+    def test_import_label_data_records_only_merged_batches(self, client, url_request, tmp_path):
+        labels = [f"label{i}" for i in range(40)]
+        labels[7] = "fail"
+        checkpoint = tmp_path / "import.journal"
+        with patch('datagym.client.Client._request', side_effect=url_request):
+            response = client.import_label_data("P1", labels, batch_size=5, max_workers=2,
+                                                checkpoint_file=checkpoint)
+            from datagym.utils.checkpoint import BatchJournal
+            assert [entry["url"] for entry in response] == labels[:5] + labels[10:25]
+            assert len(BatchJournal(checkpoint, 5)) == 4
+
+    def test_import_label_data_from_generator(self, client, url_request):
+        consumed = []
+
+        def label_entries():
+            for i in range(12):
+                consumed.append(i)
+                yield f"label{i}"
+
+        with patch('datagym.client.Client._request', side_effect=url_request) as mock_request:
+            response = client.import_label_data("P1", label_entries(), batch_size=5, max_workers=2)
+            assert [entry["url"] for entry in response] == [f"label{i}" for i in range(12)]
+            assert [len(c[1]["json"]) for c in mock_request.call_args_list] == [5, 5, 2]
+            assert consumed == list(range(12))
+
+    def test_upload_images_from_directory(self, client, tmp_path):
+        for name in ["a.jpg", "b.jpg", "c.txt"]:
+            (tmp_path / name).write_bytes(b"image")
+
+        def request(method, endpoint, headers=None, data=None, **kwargs):
+            assert not data.closed
+            if headers['X-filename'] == "b.jpg":
+                error = {"key": "ex_unknown", "params": [], "msg": "Broken image", "code": 400}
+                return self.make_response(error, 400)
+            media = {"id": "ID", "mediaName": headers['X-filename'], "mediaSourceType": "LOCAL", "timestamp": 1}
+            return self.make_response(media)
+
+        with patch('datagym.client.Client._request', side_effect=request):
+            from datagym import ClientException
+            uploaded = client.upload_images_from_directory("D1", tmp_path, pattern="*.jpg", max_workers=2)
+            assert uploaded[str(tmp_path / "a.jpg")].image_name == "a.jpg"
+            assert isinstance(uploaded[str(tmp_path / "b.jpg")], ClientException)
+            assert len(uploaded) == 2
+
+    def test_download_media_batch_skips_complete_files(self, client, tmp_path):
+        from datagym import Image
+        images = [Image({"id": f"ID{i}", "mediaName": f"{i}.jpg", "mediaSourceType": "LOCAL", "timestamp": 1})
+                  for i in range(3)]
+        (tmp_path / "0.jpg").write_bytes(b"0" * 10)
+        (tmp_path / "1.jpg").write_bytes(b"1" * 3)
+
+        def request(method, endpoint, **kwargs):
+            the_response = self.make_response(None)
+            the_response._content = b"" if method == "HEAD" else b"x" * 10
+            the_response.headers['Content-Length'] = "10"
+            return the_response
+
+        with patch('datagym.client.Client._request', side_effect=request) as mock_request:
+            report = client.download_media_batch(images, tmp_path, max_workers=2, chunk_size=4)
+            # Existing files are checked with a HEAD request, missing files are downloaded right away
+            calls = sorted((c[1]["method"], c[1]["endpoint"].split("?")[0]) for c in mock_request.call_args_list)
+            assert calls == [("GET", "api/v1/media/ID1"), ("GET", "api/v1/media/ID2"),
+                             ("HEAD", "api/v1/media/ID0"), ("HEAD", "api/v1/media/ID1")]
+            assert report["skipped"] == ["0.jpg"]
+            assert report["downloaded"] == ["1.jpg", "2.jpg"]
+            assert report["bytes"] == 20
+            assert (tmp_path / "1.jpg").read_bytes() == b"x" * 10
+            assert not list(tmp_path.glob("*.part"))
+
+    @pytest.mark.parametrize("range_support", [True, False])
+    def test_download_video_resumes_part_file(self, client, tmp_path, range_support):
+        from datagym import Video
+        video = Video({"id": "V1", "mediaName": "video.mp4", "mediaSourceType": "AWS_S3", "timestamp": 1})
+        content = bytes(range(200))
+        (tmp_path / "video.mp4.part").write_bytes(content[:70])
+
+        url_response = self.make_response(None)
+        url_response._content = b"https://storage.example.com/video.mp4"
+
+        def storage_request(method, url, headers=None, **kwargs):
+            the_response = self.make_response(None)
+            if range_support and headers and "Range" in headers:
+                offset = int(headers["Range"][len("bytes="):-1])
+                the_response.status_code = 206
+                the_response._content = content[offset:]
+            else:
+                the_response._content = content
+            return the_response
+
+        with patch('datagym.client.Client._request', return_value=url_response), \
+                patch.object(client._session, 'request', side_effect=storage_request) as mock_storage:
+            client.download_video(video, tmp_path, chunk_size=16)
+            assert mock_storage.call_args[1]["headers"] == {"Range": "bytes=70-"}
+            assert (tmp_path / "video.mp4").read_bytes() == content
+            assert not (tmp_path / "video.mp4.part").exists()
+
+    @pytest.mark.parametrize("part", [bytes(range(200)), b"stale" * 50])
+    def test_download_video_checks_unsatisfiable_range(self, client, tmp_path, part):
+        from datagym import Video
+        video = Video({"id": "V1", "mediaName": "video.mp4", "mediaSourceType": "AWS_S3", "timestamp": 1})
+        content = bytes(range(200))
+        (tmp_path / "video.mp4.part").write_bytes(part)
+
+        url_response = self.make_response(None)
+        url_response._content = b"https://storage.example.com/video.mp4"
+
+        def storage_request(method, url, headers=None, **kwargs):
+            the_response = self.make_response(None)
+            if headers and "Range" in headers:
+                the_response.status_code = 416
+                the_response._content = b""
+                the_response.headers["Content-Range"] = f"bytes */{len(content)}"
+            else:
+                the_response._content = content
+            return the_response
+
+        with patch('datagym.client.Client._request', return_value=url_response), \
+                patch.object(client._session, 'request', side_effect=storage_request):
+            client.download_video(video, tmp_path, chunk_size=16)
+            assert (tmp_path / "video.mp4").read_bytes() == content
+            assert not (tmp_path / "video.mp4.part").exists()
+
+
+class TestJsonStream:
+
+    def test_iter_json_array_single_byte_chunks(self):
+        from datagym.utils.json_stream import iter_json_array
+        values = [{"a": [1, 2.5, "x\u00e4"]}, 12345, "text", None, True, [], {}]
+        document = json.dumps(values, ensure_ascii=False).encode()
+        chunks = (document[i:i + 1] for i in range(len(document)))
+        assert list(iter_json_array(chunks)) == values
+
+    def test_iter_json_array_empty(self):
+        from datagym.utils.json_stream import iter_json_array
+        assert list(iter_json_array([b" [ ] "])) == []
+
+
+class TestModels:
+
+    @pytest.fixture
+    def dataset_data(self):
+        media = [{"id": f"ID{i}", "mediaName": f"{i % 50}.jpg", "mediaSourceType": "LOCAL", "timestamp": i}
+                 for i in range(100)]
+        return {"id": "D1", "name": "Dataset1", "shortDescription": "", "timestamp": 1,
+                "owner": "user1", "mediaType": "IMAGE", "media": media}
+
+    def test_dataset_media_indexes(self, dataset_data):
+        from datagym import Dataset, Image
+        dataset = Dataset(dataset_data)
+        assert [image.id for image in dataset.get_media_by_name("7.jpg")] == ["ID7", "ID57"]
+        matches = dataset.get_media_by_name("4[0-9].jpg", regex=True)
+        assert [image.id for image in matches] == [f"ID{i}" for i in list(range(40, 50)) + list(range(90, 100))]
+        assert dataset.get_media_by_id("ID99").image_name == "49.jpg"
+        assert dataset.get_media_by_id("unknown") is None
+        assert "_media" not in repr(dataset)
+
+        dataset.media.append(Image({"id": "NEW", "mediaName": "7.jpg", "mediaSourceType": "LOCAL", "timestamp": 1}))
+        assert [image.id for image in dataset.get_media_by_name("7.jpg")] == ["ID7", "ID57", "NEW"]
+        assert dataset.get_media_by_id("NEW") is dataset.media[-1]
+
+        dataset.media[7] = Image({"id": "SWAP", "mediaName": "swap.jpg", "mediaSourceType": "LOCAL", "timestamp": 1})
+        assert dataset.get_media_by_id("ID7") is None
+        assert dataset.get_media_by_id("SWAP") is dataset.media[7]
+        assert [image.id for image in dataset.get_media_by_name("7.jpg")] == ["ID57", "NEW"]
+
+        dataset.media = dataset.media[:10]
+        assert dataset.get_media_by_id("ID57") is None
+
+    def test_project_media_lookup(self, dataset_data):
+        from datagym import Project
+        project = Project({"id": "P1", "name": "Project1", "shortDescription": "", "timestamp": 1,
+                           "labelConfigurationId": "L", "labelIterationId": "I", "owner": "user1",
+                           "mediaType": "IMAGE", "datasets": [dataset_data, dict(dataset_data, id="D2")]})
+        assert len(project.get_media_by_name("7.jpg")) == 4
+        assert len(project.get_media_by_name(".*", regex=True)) == 200
+        assert project.get_media_by_id("ID3") is project.datasets[0].media[3]
+
+    def test_media_models_are_slotted(self):
+        from datagym import Image, Video
+        data = {"id": "ID1", "mediaName": "a.jpg", "mediaSourceType": "LOCAL", "timestamp": 1}
+        image, video = Image(data), Video(dict(data, mediaName="a.mp4"))
+        assert not hasattr(image, "__dict__") and not hasattr(video, "__dict__")
+        assert repr(image) == "<Image {'id': 'ID1', 'image_name': 'a.jpg', 'image_type': 'LOCAL', 'timestamp': 1}>"
+        assert repr(video) == "<Video {'id': 'ID1', 'video_name': 'a.mp4', 'video_type': 'LOCAL', 'timestamp': 1}>"
+
+    def test_dataset_media_is_built_lazily(self, dataset_data):
+        from datagym import Dataset
+        dataset = Dataset(dataset_data)
+        assert dataset.media_count == 100
+        assert "<List[Image] with 100 elements>" in repr(dataset)
+        assert [image.id for image in dataset.iter_media()][:2] == ["ID0", "ID1"]
+        assert dataset._media is None
+
+        assert dataset.images is dataset.media
+        assert dataset.media[5] is dataset.media[5]
+        assert next(dataset.iter_media()) is dataset.media[0]
+        assert dataset.media_count == 100